@@ -1,99 +1,75 @@
-from flask import Flask, request
-from .extensions import db, ma, limiter, mail, cors
+from flask import Flask
+from .extensions import db, ma, limiter, mail, cors, response_cache, project_search
 from .config import Config
 from .health.routes import bp as health_bp
 from .projects.routes import bp as projects_bp
 from app.error_handlers import register_error_handlers
+from app.utils.http_cache import register_http_cache
+from app.utils.compression import compressor
 from .contact.routes import bp as contact_bp
-import logging
-from logging.handlers import RotatingFileHandler
-import re
+from .services.outbox import outbox_worker, register_outbox_commands
+from .services.write_buffer import write_buffer
+from .services.static_export import register_export_commands
+from .services.bulk_import import register_import_commands
+from .services.http_client import http_client
+from .services.verify_captcha import captcha_guard
+from .services.metrics import metrics
+from .services.db_pool import build_engine_options, pool_monitor
+from .services.db_routing import replica_router
+from .services.markdown_render import markdown_cache
+from app.utils.structured_logging import configure_logging
+from app.utils.json_provider import configure_json
 
 
 def create_app(config_object=Config):
     app = Flask(__name__)
     app.config.from_object(config_object)
+    configure_json(app)
     # Accept routes with and without a trailing slash to avoid 308 redirects (helps with CORS across origins)
     app.url_map.strict_slashes = False
 
     # --- Logging setup ---
-    log_formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s - %(message)s", "%Y-%m-%d %H:%M:%S"
-    )
-
-    # File handler (rotating)
-    file_handler = RotatingFileHandler(
-        "app.log", maxBytes=1_000_000, backupCount=5, encoding="utf-8"
-    )
-    file_handler.setFormatter(log_formatter)
-    file_handler.setLevel(logging.INFO)
-
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(log_formatter)
-    console_handler.setLevel(logging.INFO)
-
-    # Root logger setup
-    app.logger.setLevel(logging.INFO)
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(console_handler)
-
+    configure_logging(app)
     app.logger.info("✅ Flask app initialized and logging configured.")
     # --- End Logging setup ---
 
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", build_engine_options(app.config))
     db.init_app(app)
+    pool_monitor.init_app(app, db)
+    response_cache.init_app(app)
+    replica_router.init_app(
+        app, db, catalog_version=response_cache.version, shared=response_cache.shared
+    )
     ma.init_app(app)
     limiter.init_app(app)
     mail.init_app(app)
-    # --- CORS init ---
-    # Parse comma-separated CORS_ORIGINS from env/config, support regex via prefix "regex:"
-    origins_raw = app.config.get("CORS_ORIGINS", "*")
-    if isinstance(origins_raw, str):
-        origins_list = (
-            ["*"]
-            if origins_raw.strip() == "*"
-            else [o.strip() for o in origins_raw.split(",") if o.strip()]
-        )
-    else:
-        origins_list = origins_raw if origins_raw is not None else ["*"]
-
-    # Compile regex entries like: regex:https://.*\.vercel\.app
-    compiled_origins = []
-    for o in origins_list:
-        if isinstance(o, str) and o.lower().startswith("regex:"):
-            pattern = o[len("regex:") :].strip()
-            try:
-                compiled_origins.append(re.compile(pattern))
-            except re.error:
-                # Ignore invalid regex so the app still boots
-                continue
-        else:
-            compiled_origins.append(o)
-
-    # In debug we can allow wildcard (*) to ease local testing
-    is_debug = bool(app.config.get("DEBUG"))
-    use_wildcard = is_debug and compiled_origins != ["*"]
-
-    cors.init_app(
-        app,
-        resources={
-            r"/api/*": {"origins": "*" if use_wildcard else compiled_origins},
-            r"/health": {"origins": "*" if use_wildcard else compiled_origins},
-        },
-        supports_credentials=False,
-        allow_headers=app.config["CORS_ALLOW_HEADERS"],
-        methods=app.config["CORS_METHODS"],
-        max_age=app.config["CORS_MAX_AGE"],
-        expose_headers=[],
-    )
-    # --- end CORS ---
+    project_search.init_app(app)
+    http_client.init_app(app)
+    captcha_guard.init_app(app)
+    markdown_cache.init_app(app)
+    outbox_worker.init_app(app)
+    write_buffer.init_app(app)
+    if app.config.get("METRICS_ENABLED", True):
+        metrics.init_app(app)
+        metrics.add_collector(http_client.collect_metrics)
+        metrics.add_collector(captcha_guard.collect_metrics)
+        metrics.add_collector(pool_monitor.collect_metrics)
+        metrics.add_collector(write_buffer.collect_metrics)
+        metrics.add_collector(response_cache.collect_metrics)
+    register_outbox_commands(app)
+    register_export_commands(app)
+    register_import_commands(app)
+    # --- CORS (app/utils/cors.py) ---
+    cors.init_app(app)
 
     # --- Rate-limit default ---
     limiter.default_limits = [app.config.get("RATELIMIT_DEFAULT", "100 per hour")]
-    limiter.storage_uri = app.config.get("RATELIMIT_STORAGE_URI", "memory://")
+    limiter.storage_uri = app.config.get("RATELIMIT_STORAGE_URI")
     # --- end Rate-limit ---
 
     register_error_handlers(app)
+    register_http_cache(app)
+    compressor.init_app(app)
 
     app.register_blueprint(health_bp, url_prefix="/")
     app.register_blueprint(projects_bp, url_prefix="/api/projects")
@@ -104,19 +80,4 @@ def create_app(config_object=Config):
     def root():
         return {"status": "ok", "message": "API root"}, 200
 
-    @app.after_request
-    def add_cors_headers(response):
-        origin = request.headers.get("Origin")
-        allowed_origins = [
-            "https://personal-site-alpha-rosy.vercel.app",
-            "https://www.sivan.dev",
-            "http://localhost:5173",
-            "https://www.sivan-pesahov.dev",
-        ]
-        if origin in allowed_origins:
-            response.headers["Access-Control-Allow-Origin"] = origin
-            response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
-            response.headers["Access-Control-Allow-Headers"] = "Content-Type"
-        return response
-
     return app
@@ -1,28 +1,29 @@
 from flask import Blueprint, request, jsonify, current_app
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
-import bleach
-import re
-import socket
 
 from app.extensions import db, limiter
 from app.models import ContactMessage
 from .schemas import ContactCreateSchema, ContactPublicSchema
-from app.services.email_service import send_contact_email
+from app.services.outbox import outbox_worker, PENDING, SUPPRESSED
 from app.services.verify_captcha import verify_captcha
+from app.services.db_routing import replica_router
+from app.services.write_buffer import write_buffer
+from app.utils.client_ip import client_ip
+from app.utils.text_sanitizer import sanitize_text
 
 bp = Blueprint("contact", __name__)
 create_schema = ContactCreateSchema()
 public_schema = ContactPublicSchema()
 
-_ws_re = re.compile(r"\s+")
 
+def _notify_outbox(messages):
+    # Wake the outbox once the rows are committed, whether or not they were buffered
+    if any(m.delivery_status == PENDING for m in messages):
+        outbox_worker.notify()
 
-def sanitize_text(value: str) -> str:
 
-    cleaned = bleach.clean(text=value, tags=[], attributes={}, protocols=[], strip=True)
-    cleaned = _ws_re.sub(" ", cleaned).strip()
-    return cleaned
+write_buffer.on_commit(ContactMessage, _notify_outbox)
 
 
 @bp.route("", methods=["POST"])
@@ -50,12 +51,7 @@ def create_contact_message():
     # ---- CAPTCHA verification ----
     token = json_data.get("captcha_token")
 
-    # Try common headers for client IP (useful behind proxies / Cloudflare), fallback to remote_addr
-    xff = request.headers.get("X-Forwarded-For", "")
-    cf_ip = request.headers.get("CF-Connecting-IP")
-    remote_ip = (
-        cf_ip or (xff.split(",")[0].strip() if xff else None)
-    ) or request.remote_addr
+    remote_ip = client_ip()
 
     current_app.logger.info("[contact] verifying captcha (ip=%s)", remote_ip)
 
@@ -93,15 +89,19 @@ def create_contact_message():
             400,
         )
 
+    suppress_send = current_app.config.get("MAIL_SUPPRESS_SEND", False)
+
     try:
+        # The email itself is sent by the outbox worker, not in this request
         cm = ContactMessage(
             name=name_clean,
             email=email.strip(),
             message=message_clean,
             created_at=datetime.utcnow(),
+            delivery_status=SUPPRESSED if suppress_send else PENDING,
         )
-        db.session.add(cm)
-        db.session.commit()
+        committed = write_buffer.save(cm)
+        replica_router.stick_to_primary()
     except SQLAlchemyError:
         db.session.rollback()
         return (
@@ -114,21 +114,11 @@ def create_contact_message():
             500,
         )
 
-    if current_app.config.get("MAIL_SUPPRESS_SEND", False):
+    if suppress_send:
         current_app.logger.info(
-            "[contact] MAIL_SUPPRESS_SEND=true -> skipping SMTP and returning success"
+            "[contact] MAIL_SUPPRESS_SEND=true -> not queueing email, returning success"
         )
-        return jsonify({"data": public_schema.dump(cm), "error": None}), 201
+    else:
+        current_app.logger.info("[contact] message %s queued for email", cm.id)
 
-    try:
-        prev_to = socket.getdefaulttimeout()
-        socket.setdefaulttimeout(5)
-        current_app.logger.info("[contact] sending email via provider=brevo…")
-        send_contact_email(name=name_clean, email=email.strip(), message=message_clean)
-        current_app.logger.info("[contact] email sent")
-    except Exception as e:
-        current_app.logger.exception("[contact] Failed to send contact email: %s", e)
-    finally:
-        socket.setdefaulttimeout(prev_to)
-
-    return jsonify({"data": public_schema.dump(cm), "error": None}), 201
+    return jsonify({"data": public_schema.dump(cm), "error": None}), 201 if committed else 202
@@ -7,6 +7,8 @@ from werkzeug.exceptions import (
     MethodNotAllowed,
 )
 
+from app.services.metrics import metrics
+from app.services.write_buffer import WriteBufferFull, WriteTimeout
 from app.utils.responses import json_response
 
 
@@ -16,6 +18,7 @@ def register_error_handlers(app):
     # 429 - Rate limited
     @app.errorhandler(TooManyRequests)
     def handle_rate_limit(e: TooManyRequests):
+        metrics.inc("rate_limit_rejections_total", endpoint=request.endpoint or "unmatched")
         # Try to extract Retry-After from the generated response (if exists)
         retry_after = None
         try:
@@ -34,6 +37,22 @@ def register_error_handlers(app):
             status=429,
         )
 
+    # 503 - Write buffer full or flush timed out (see services/write_buffer.py)
+    @app.errorhandler(WriteBufferFull)
+    @app.errorhandler(WriteTimeout)
+    def handle_write_buffer_unavailable(e):
+        response, status = json_response(
+            data=None,
+            error={
+                "code": "WRITE_BUFFER_FULL" if isinstance(e, WriteBufferFull) else "WRITE_TIMEOUT",
+                "message": e.description,
+                "path": request.path,
+            },
+            status=503,
+        )
+        response.headers["Retry-After"] = str(e.retry_after or 1)
+        return response, status
+
     # 404 - Not found
     @app.errorhandler(NotFound)
     def handle_not_found(e: NotFound):
@@ -1,18 +1,29 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flask_mail import Mail
-from flask_cors import CORS
 
-db = SQLAlchemy()
+from app.services.cache import ResponseCache
+from app.services.search import ProjectSearch
+from app.services.db_routing import RoutingSession
+# Registers the sqlite:// storage scheme with `limits`
+from app.services import rate_limit_storage  # noqa: F401
+from app.utils.client_ip import rate_limit_key
+from app.utils.cors import CorsEngine
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 ma = Marshmallow()
 mail = Mail()
-cors = CORS()
+cors = CorsEngine()
+response_cache = ResponseCache()
+project_search = ProjectSearch()
 
 limiter = Limiter(
-    key_func=get_remote_address,
+    # CF-Connecting-IP / X-Forwarded-For aware, so clients behind the proxy
+    # don't share one bucket
+    key_func=rate_limit_key,
     # default limits & storage will be read from app.config:
     # RATELIMIT_DEFAULT (e.g., "100 per hour")
-    # RATELIMIT_STORAGE_URI (e.g., "memory://")
+    # RATELIMIT_STORAGE_URI (e.g., "sqlite:////tmp/personal-site-ratelimit.db")
+    # RATELIMIT_STRATEGY (e.g., "sliding-window-counter")
 )
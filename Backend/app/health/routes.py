@@ -1,11 +1,24 @@
-from flask import Blueprint
+import hmac
+import ipaddress
+
+from flask import Blueprint, Response, abort, current_app, request
 from sqlalchemy import text
-from app.extensions import db
+from app.extensions import db, limiter
+from app.services.db_routing import REPLICA_BIND, replica_router
+from app.services.metrics import metrics as metrics_registry
+from app.utils.client_ip import client_ip
 from app.utils.responses import json_response
 
 bp = Blueprint("health", __name__)
 
 
+def _is_loopback(addr) -> bool:
+    try:
+        return ipaddress.ip_address(addr or "").is_loopback
+    except ValueError:
+        return False
+
+
 @bp.get("/health")
 def health():
 
@@ -23,5 +36,34 @@ def health():
         "status": "ok",
         "db": {"ok": db_ok, "error": db_error},
     }
+
+    if replica_router.enabled:
+        replica = {"ok": False, "error": None, **replica_router.replica_status()}
+        try:
+            with db.engines[REPLICA_BIND].connect() as conn:
+                conn.execute(text("SELECT 1"))
+            replica["ok"] = True
+        except Exception as e:
+            replica["error"] = str(e)
+        data["db"]["replica"] = replica
+
     # Return 200 even if DB check fails, keeping consistency with uptime monitors.
     return json_response(data=data, error=None, status=200)
+
+
+@bp.get("/metrics")
+@limiter.exempt
+def metrics():
+    if not current_app.config.get("METRICS_ENABLED", True):
+        abort(404)
+    token = current_app.config.get("METRICS_TOKEN")
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, token):
+            abort(401)
+    elif not current_app.config.get("METRICS_PUBLIC", False) and not _is_loopback(client_ip()):
+        # Pool, outbox and captcha internals are not for the public internet
+        abort(403)
+    return Response(
+        metrics_registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
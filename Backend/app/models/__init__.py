@@ -1,7 +1,9 @@
-from .models import Project, Comment, ContactMessage
+from .models import Project, ProjectImage, Comment, ContactMessage, ImportCheckpoint
 
 __all__ = [
     "Project",
+    "ProjectImage",
     "Comment",
     "ContactMessage",
+    "ImportCheckpoint",
 ]
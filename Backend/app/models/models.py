@@ -1,9 +1,26 @@
-from sqlalchemy import func
+import json
+from collections import Counter
+
+from sqlalchemy import case, event, func, inspect, or_, select, update
+from sqlalchemy.orm import Session
 from ..extensions import db
 
 
 class Project(db.Model):
     __tablename__ = "project"
+    __table_args__ = (
+        # FULLTEXT on MySQL (used by SEARCH_BACKEND=fulltext), plain index elsewhere
+        db.Index(
+            "ft_project_search",
+            "title",
+            "short_description",
+            "description_md",
+            mysql_prefix="FULLTEXT",
+        ),
+        # ?sort=discussed / ?sort=active on the project list
+        db.Index("ix_project_comment_count_id", "comment_count", "id"),
+        db.Index("ix_project_last_comment_at_id", "last_comment_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     slug = db.Column(db.String(255), unique=True, nullable=False, index=True)
@@ -15,6 +32,11 @@ class Project(db.Model):
     images_json = db.Column(db.Text)
     repo_url = db.Column(db.String(1024))
     live_url = db.Column(db.String(1024))
+    # Denormalized from comment, maintained in the writing transaction (see below)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    last_comment_at = db.Column(db.DateTime, nullable=True)
+    # Last write to the row (comment stats included): Last-Modified of project responses
+    updated_at = db.Column(db.DateTime, nullable=True, default=func.now(), onupdate=func.now())
 
     comments = db.relationship(
         "Comment",
@@ -22,13 +44,89 @@ class Project(db.Model):
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
+    # Normalized copy of images_json, kept in sync on flush (see below)
+    gallery = db.relationship(
+        "ProjectImage",
+        order_by="ProjectImage.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def __repr__(self) -> str:
         return f"<Project {self.slug}>"
 
 
+class ProjectImage(db.Model):
+    __tablename__ = "project_image"
+    __table_args__ = (
+        db.UniqueConstraint("project_id", "position", name="uq_project_image_position"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(
+        db.Integer,
+        db.ForeignKey("project.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    position = db.Column(db.Integer, nullable=False)
+    url = db.Column(db.String(1024), nullable=False)
+    width = db.Column(db.Integer, nullable=True)
+    height = db.Column(db.Integer, nullable=True)
+    # Optional resized/format variants, e.g. {"mobile": "...", "webp": "..."}
+    variants = db.Column(db.JSON, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ProjectImage {self.position} of project {self.project_id}>"
+
+
+def image_urls_from_json(images_json):
+    """
+    URLs from an images_json value, or None when it isn't a plain list of
+    strings (such rows are served by decoding images_json instead).
+    """
+    if not images_json:
+        return []
+    try:
+        images = json.loads(images_json)
+    except ValueError:
+        return None
+    if not isinstance(images, list) or not all(isinstance(i, str) for i in images):
+        return None
+    return images
+
+
+@event.listens_for(Session, "before_flush")
+def _sync_project_gallery(session, flush_context, instances):
+    # images_json stays the write interface (seed, admin scripts); the
+    # project_image rows are rebuilt whenever it changes.
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Project):
+            continue
+        state = inspect(obj)
+        if not state.pending and not state.attrs.images_json.history.has_changes():
+            continue
+        urls = image_urls_from_json(obj.images_json) or []
+        # Reuse rows by position so (project_id, position) never collides
+        # within one flush (updates/inserts run before deletes)
+        rows = obj.gallery
+        for position, url in enumerate(urls):
+            if position < len(rows):
+                if rows[position].url != url:
+                    rows[position].url = url
+                    rows[position].width = rows[position].height = None
+                    rows[position].variants = None
+            else:
+                rows.append(ProjectImage(position=position, url=url))
+        del rows[len(urls) :]
+
+
 class Comment(db.Model):
     __tablename__ = "comment"
+    __table_args__ = (
+        # Keyset pagination: newest-first pages per project on (created_at, id)
+        db.Index("ix_comment_project_created_id", "project_id", "created_at", "id"),
+        db.Index("ix_comment_import_key", "import_key", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(
@@ -42,6 +140,9 @@ class Comment(db.Model):
     content = db.Column(db.Text, nullable=False)
 
     created_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+    # Natural-key hash of comments bulk-imported without an id, so a re-run
+    # upserts them instead of inserting duplicates (NULL for regular comments)
+    import_key = db.Column(db.String(32), nullable=True)
 
     project = db.relationship("Project", back_populates="comments")
 
@@ -49,6 +150,77 @@ class Comment(db.Model):
         return f"<Comment {self.id} on project {self.project_id}>"
 
 
+def _latest_comment_at():
+    return (
+        select(func.max(Comment.created_at))
+        .where(Comment.project_id == Project.id)
+        .scalar_subquery()
+    )
+
+
+def apply_comment_stats(session, new=(), deleted=()) -> None:
+    """
+    Update Project.comment_count / last_comment_at for inserted (`new`) and
+    deleted Comment objects, in the session's current transaction. Runs
+    after every ORM flush; callers writing comments with Core statements
+    call it themselves.
+    """
+    deltas = Counter()
+    for obj in new:
+        if isinstance(obj, Comment):
+            deltas[obj.project_id] += 1
+    for obj in deleted:
+        if isinstance(obj, Comment):
+            deltas[obj.project_id] -= 1
+
+    by_delta = {}
+    for project_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(project_id)
+    latest = _latest_comment_at()
+    for delta, project_ids in by_delta.items():
+        if delta > 0:
+            # Only ever move forward, so concurrent writers can't undo each other
+            last_comment_at = case(
+                (
+                    or_(Project.last_comment_at.is_(None), Project.last_comment_at < latest),
+                    latest,
+                ),
+                else_=Project.last_comment_at,
+            )
+        else:
+            last_comment_at = latest
+        session.execute(
+            update(Project)
+            .where(Project.id.in_(project_ids))
+            .values(
+                comment_count=Project.comment_count + delta,
+                last_comment_at=last_comment_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def refresh_comment_stats(session, project_ids=None) -> None:
+    """Recount comment_count / last_comment_at from the comment table (all projects when None)."""
+    stmt = update(Project).values(
+        comment_count=select(func.count(Comment.id))
+        .where(Comment.project_id == Project.id)
+        .scalar_subquery(),
+        last_comment_at=_latest_comment_at(),
+    )
+    if project_ids is not None:
+        if not project_ids:
+            return
+        stmt = stmt.where(Project.id.in_(list(project_ids)))
+    session.execute(stmt.execution_options(synchronize_session=False))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_comment_stats(session, flush_context):
+    apply_comment_stats(session, session.new, session.deleted)
+
+
 class ContactMessage(db.Model):
     __tablename__ = "contact_message"
 
@@ -59,12 +231,46 @@ class ContactMessage(db.Model):
 
     created_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
 
+    # Email outbox state: pending -> sending -> sent, or dead after max attempts
+    delivery_status = db.Column(
+        db.String(16), nullable=False, default="pending", server_default="pending"
+    )
+    delivery_attempts = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    next_attempt_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.String(500), nullable=True)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_contact_message_outbox", "delivery_status", "next_attempt_at"),
+    )
+
     def __repr__(self) -> str:
         return f"<ContactMessage {self.id}>"
 
 
+class ImportCheckpoint(db.Model):
+    """Progress of a bulk import, committed in the same transaction as each chunk."""
+
+    __tablename__ = "import_checkpoint"
+
+    # Hash of the absolute input path (a long path would not fit an index)
+    input_key = db.Column(db.String(32), primary_key=True)
+    path = db.Column(db.String(1024), nullable=False)
+    kind = db.Column(db.String(16), nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    mtime_ns = db.Column(db.BigInteger, nullable=False)
+    committed = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<ImportCheckpoint {self.path}: {self.committed}>"
+
+
 __all__ = [
     "Project",
+    "ProjectImage",
     "Comment",
     "ContactMessage",
+    "ImportCheckpoint",
 ]
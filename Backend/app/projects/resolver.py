@@ -0,0 +1,50 @@
+import threading
+from typing import Dict, Optional
+
+from app.extensions import db, response_cache
+from app.models.models import Project
+
+
+class SlugResolver:
+    """
+    In-process slug -> project id map.
+
+    Slugs are stable between catalog writes, so the map is dropped whenever
+    the catalog version changes; unknown slugs are never cached.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def cached_id(self, slug: str) -> Optional[int]:
+        version = response_cache.version()
+        with self._lock:
+            if self._version != version:
+                self._ids.clear()
+                self._version = version
+            return self._ids.get(slug)
+
+    def remember(self, slug: str, project_id: int) -> None:
+        with self._lock:
+            self._ids[slug] = project_id
+
+    def forget(self, slug: str) -> None:
+        with self._lock:
+            self._ids.pop(slug, None)
+
+    def resolve(self, slug: str) -> Optional[int]:
+        """Project id for `slug`, hitting the DB only on a map miss."""
+        project_id = self.cached_id(slug)
+        if project_id is not None:
+            return project_id
+        project_id = (
+            db.session.query(Project.id).filter(Project.slug == slug).scalar()
+        )
+        if project_id is not None:
+            self.remember(slug, project_id)
+        return project_id
+
+
+slug_resolver = SlugResolver()
@@ -1,94 +1,299 @@
+from datetime import datetime
+
 from flask import Blueprint, request
-from sqlalchemy import or_, func, desc
-import bleach
-from marshmallow import EXCLUDE
+from sqlalchemy import or_, and_, func, select
+from sqlalchemy.orm import aliased, joinedload
+from marshmallow import ValidationError
 
-from app.utils.responses import json_response
+from app.utils.responses import json_response, json_body
+from app.utils.http_cache import conditional_json_response, conditional_body_response
 from app.models.models import Project, Comment
 from app.projects.schemas import (
-    ProjectListSchema,
-    ProjectDetailSchema,
-    CommentPublicSchema,
-    CommentCreateSchema,
+    project_detail_schema,
+    comment_public_schema,
+    comments_public_schema,
+    comment_create_schema,
+    dump_project_list,
+)
+from app.extensions import db, limiter, response_cache, project_search
+from app.utils.pagination import (
+    PaginationError,
+    encode_cursor,
+    decode_cursor,
+    parse_limit,
 )
-from app.extensions import db, limiter
+from app.projects.resolver import slug_resolver
 from app.services.verify_captcha import verify_captcha
+from app.services.db_routing import replica_reads, replica_router
+from app.services.cache import CacheEntry
+from app.services.markdown_render import markdown_cache
+from app.services.write_buffer import write_buffer
+from app.utils.client_ip import client_ip
+from app.utils.text_sanitizer import clean_text, sanitize_text
 
 bp = Blueprint("projects", __name__)
 
+COMMENTS_PAGE_SIZE = 20
+COMMENTS_MAX_PAGE_SIZE = 100
+DESCRIPTION_FORMATS = ("md", "html")
+# ?sort= for the project list: ORDER BY (served by a (column, id) index) and
+# the same order for ranked search results. Without it: newest, or relevance with ?q=
+PROJECT_SORTS = {
+    "newest": ((Project.id.desc(),), lambda p: (p.id,)),
+    "discussed": (
+        (Project.comment_count.desc(), Project.id.desc()),
+        lambda p: (p.comment_count, p.id),
+    ),
+    "active": (
+        (Project.last_comment_at.desc(), Project.id.desc()),
+        lambda p: (p.last_comment_at or datetime.min, p.id),
+    ),
+}
 
-@bp.get("/")
-def list_projects():
-    q = (request.args.get("q") or "").strip()
+# New comments change cached comment pages (also for buffered, batched inserts)
+write_buffer.on_commit(Comment, lambda comments: response_cache.bump_version(projects=False))
 
-    query = Project.query
 
-    if q:
-        ql = q.lower()
+def _last_modified(projects):
+    """Newest row change or comment across `projects` (None when unknown)."""
+    return max(
+        (
+            stamp
+            for project in projects
+            for stamp in (project.updated_at, project.last_comment_at)
+            if stamp is not None
+        ),
+        default=None,
+    )
+
+
+def _comments_page(project_id: int, limit: int, after=None):
+    """
+    One page of comments, newest first, using keyset pagination on
+    (created_at, id) — served by ix_comment_project_created_id.
+    """
+    query = Comment.query.filter(Comment.project_id == project_id)
+    if after is not None:
+        created_at, comment_id = after
         query = query.filter(
             or_(
-                func.lower(Project.title).like(f"%{ql}%"),
-                func.lower(Project.short_description).like(f"%{ql}%"),
-                func.lower(Project.description_md).like(f"%{ql}%"),
+                Comment.created_at < created_at,
+                and_(Comment.created_at == created_at, Comment.id < comment_id),
             )
         )
+    rows = (
+        query.order_by(Comment.created_at.desc(), Comment.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def _project_with_first_page(slug: str, limit: int):
+    """
+    Load a project, its newest `limit` comments and the comment total in a
+    single statement (window functions over the composite comment index).
+
+    Returns (project, comments, total, next_cursor) or None if not found.
+    """
+    project_id = slug_resolver.cached_id(slug)
+    target = (
+        project_id
+        if project_id is not None
+        else select(Project.id).where(Project.slug == slug).scalar_subquery()
+    )
+
+    ranked = (
+        select(
+            Comment,
+            func.row_number()
+            .over(order_by=(Comment.created_at.desc(), Comment.id.desc()))
+            .label("rn"),
+            func.count().over().label("total"),
+        )
+        .where(Comment.project_id == target)
+        .subquery()
+    )
+    page_comment = aliased(Comment, ranked)
+    rows = db.session.execute(
+        select(Project, page_comment, ranked.c.total)
+        .outerjoin(
+            ranked, and_(ranked.c.project_id == Project.id, ranked.c.rn <= limit + 1)
+        )
+        .where(Project.id == target)
+        .order_by(ranked.c.rn)
+    ).all()
+
+    if not rows:
+        if project_id is not None:
+            # Stale map entry (e.g. the catalog changed in another process)
+            slug_resolver.forget(slug)
+            return _project_with_first_page(slug, limit)
+        return None
 
-    query = query.order_by(Project.id.desc())
+    project = rows[0][0]
+    slug_resolver.remember(slug, project.id)
+    comments = [row[1] for row in rows if row[1] is not None]
+    total = rows[0][2] or 0
 
-    items = query.all()
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+    return project, comments, total, next_cursor
 
-    data = ProjectListSchema(many=True).dump(items)
-    return json_response(data=data, error=None, status=200)
+
+@bp.get("/")
+@replica_reads
+def list_projects():
+    q = (request.args.get("q") or "").strip()
+    sort = (request.args.get("sort") or "").lower()
+    if sort and sort not in PROJECT_SORTS:
+        return json_response(
+            data=None,
+            error={
+                "code": "VALIDATION_ERROR",
+                "message": f"sort must be one of: {', '.join(PROJECT_SORTS)}",
+            },
+            status=400,
+        )
+
+    # Free-text searches are not cached: every distinct q would be a new entry
+    # (and a shared-store write); the search index already answers them from memory
+    cache_key = f"projects:list:{sort}"
+    if not q:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return conditional_json_response(cached)
+    version = response_cache.version()
+
+    # Images come from project_image in the same statement (no JSON decoding)
+    query = Project.query.options(joinedload(Project.gallery))
+
+    ranked_ids = (
+        project_search.search_ids(db, q, response_cache.projects_version()) if q else None
+    )
+
+    if ranked_ids is not None:
+        # Ranked search: fetch the matching rows and keep the relevance order
+        rows = query.filter(Project.id.in_(ranked_ids)).all() if ranked_ids else []
+        by_id = {p.id: p for p in rows}
+        items = [by_id[i] for i in ranked_ids if i in by_id]
+        if sort:
+            items.sort(key=PROJECT_SORTS[sort][1], reverse=True)
+    else:
+        if q:
+            ql = q.lower()
+            query = query.filter(
+                or_(
+                    func.lower(Project.title).like(f"%{ql}%"),
+                    func.lower(Project.short_description).like(f"%{ql}%"),
+                    func.lower(Project.description_md).like(f"%{ql}%"),
+                )
+            )
+
+        query = query.order_by(*PROJECT_SORTS[sort or "newest"][0])
+
+        items = query.all()
+
+    data = dump_project_list(items)
+    body = json_body(data=data)
+    if q:
+        entry = CacheEntry(body, version, 0.0, last_modified=_last_modified(items))
+    else:
+        entry = response_cache.set(cache_key, body, version, _last_modified(items))
+    return conditional_json_response(entry)
 
 
 @bp.get("/<string:slug>")
+@replica_reads
 def get_project(slug: str):
-    project = Project.query.filter_by(slug=slug).first()
-    if not project:
+    # ?format=html: pre-rendered description (sanitized HTML, excerpt, TOC)
+    # instead of raw markdown, so the client needs no markdown parser
+    fmt = (request.args.get("format") or "md").lower()
+    if fmt not in DESCRIPTION_FORMATS:
+        return json_response(
+            data=None,
+            error={
+                "code": "VALIDATION_ERROR",
+                "message": f"format must be one of: {', '.join(DESCRIPTION_FORMATS)}",
+            },
+            status=400,
+        )
+
+    cache_key = f"projects:detail:{slug}" + (":html" if fmt == "html" else "")
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return conditional_json_response(cached)
+    version = response_cache.version()
+
+    found = _project_with_first_page(slug, COMMENTS_PAGE_SIZE)
+    if found is None:
         return json_response(
             data=None,
             error={"code": "NOT_FOUND", "message": "Project not found"},
             status=404,
         )
+    project, comments, comments_total, next_cursor = found
 
-    comments = (
-        Comment.query.filter_by(project_id=project.id)
-        .order_by(Comment.created_at.desc())
-        .all()
-    )
-
-    project_dict = ProjectDetailSchema().dump(project)
-    project_dict["comments"] = CommentPublicSchema(many=True).dump(comments)
+    # comments are attached below; excluding them avoids a lazy load of the relationship
+    project_dict = project_detail_schema.dump(project)
+    project_dict["comments"] = comments_public_schema.dump(comments)
+    project_dict["comments_total"] = comments_total
+    project_dict["comments_next_cursor"] = next_cursor
+    if fmt == "html":
+        rendered = markdown_cache.render(project_dict.pop("description_md", None) or "")
+        project_dict["description_html"] = rendered.html
+        project_dict["description_excerpt"] = rendered.excerpt
+        project_dict["description_toc"] = rendered.toc
 
-    return json_response(data=project_dict, error=None, status=200)
+    entry = response_cache.set(
+        cache_key, json_body(data=project_dict), version, _last_modified([project])
+    )
+    return conditional_json_response(entry)
 
 
 @bp.get("/<string:slug>/comments")
+@replica_reads
 def get_project_comments(slug: str):
-    project = Project.query.filter_by(slug=slug).first()
-    if not project:
+    project_id = slug_resolver.resolve(slug)
+    if project_id is None:
         return json_response(
             data=None,
             error={"code": "NOT_FOUND", "message": "Project not found"},
             status=404,
         )
 
-    comments = (
-        Comment.query.filter_by(project_id=project.id)
-        .order_by(desc(Comment.created_at))
-        .all()
-    )
+    try:
+        limit = parse_limit(
+            request.args.get("limit"), COMMENTS_PAGE_SIZE, COMMENTS_MAX_PAGE_SIZE
+        )
+        after = decode_cursor(request.args.get("cursor"))
+    except PaginationError as e:
+        return json_response(
+            data=None,
+            error={"code": "VALIDATION_ERROR", "message": str(e)},
+            status=400,
+        )
 
-    data = CommentPublicSchema(many=True).dump(comments)
-    return json_response(data=data, error=None, status=200)
+    comments, next_cursor = _comments_page(project_id, limit, after)
+
+    data = comments_public_schema.dump(comments)
+    return conditional_body_response(
+        json_body(data=data, meta={"next_cursor": next_cursor, "limit": limit})
+    )
 
 
 @bp.post("/<string:slug>/comments")
 @limiter.limit("5 per minute")
 def create_project_comment(slug: str):
 
-    project = Project.query.filter_by(slug=slug).first()
-    if not project:
+    project_id = slug_resolver.resolve(slug)
+    if project_id is None:
         return json_response(
             data=None,
             error={"code": "NOT_FOUND", "message": "Project not found"},
@@ -96,19 +301,16 @@ def create_project_comment(slug: str):
         )
 
     payload = request.get_json(silent=True) or {}
-    print(payload)
 
-    schema = CommentCreateSchema(unknown=EXCLUDE)
-    errors = schema.validate(payload)
-    if errors:
+    try:
+        valid = comment_create_schema.load(payload)
+    except ValidationError as e:
         return json_response(
             data=None,
-            error={"code": "VALIDATION_ERROR", "details": errors},
+            error={"code": "VALIDATION_ERROR", "details": e.messages},
             status=400,
         )
 
-    valid = schema.load(payload)
-
     # --- CAPTCHA verification ---
     token = payload.get("captcha_token")
     if not token:
@@ -118,14 +320,7 @@ def create_project_comment(slug: str):
             status=400,
         )
 
-    # detect client IP (supports proxy/CDN headers)
-    remote_ip = (
-        request.headers.get("CF-Connecting-IP")
-        or (request.headers.get("X-Forwarded-For") or "").split(",")[0].strip()
-        or request.remote_addr
-    )
-
-    ok = verify_captcha(token, remote_ip)
+    ok = verify_captcha(token, client_ip())
     if not ok:
         return json_response(
             data=None,
@@ -134,12 +329,9 @@ def create_project_comment(slug: str):
         )
     # --- end CAPTCHA verification ---
 
-    clean_name = bleach.clean(valid["name"], tags=[], attributes={}, strip=True)
-    clean_email = bleach.clean(valid["email"], tags=[], attributes={}, strip=True)
-    clean_content = bleach.clean(valid["content"], tags=[], attributes={}, strip=True)
-
-    clean_name = " ".join(clean_name.split())
-    clean_content = " ".join(clean_content.split())
+    clean_name = sanitize_text(valid["name"])
+    clean_email = clean_text(valid["email"])
+    clean_content = sanitize_text(valid["content"])
     if not clean_content:
         return json_response(
             data=None,
@@ -160,13 +352,14 @@ def create_project_comment(slug: str):
         )
 
     comment = Comment(
-        project_id=project.id,
+        project_id=project_id,
         name=clean_name,
         email=clean_email,
         content=clean_content,
     )
-    db.session.add(comment)
-    db.session.commit()
+    # 202 when the write buffer only queued the row (WRITE_BUFFER_DURABILITY=enqueue)
+    committed = write_buffer.save(comment)
+    replica_router.stick_to_primary()
 
-    data = CommentPublicSchema().dump(comment)
-    return json_response(data=data, error=None, status=201)
+    data = comment_public_schema.dump(comment)
+    return json_response(data=data, error=None, status=201 if committed else 202)
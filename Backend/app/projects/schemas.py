@@ -1,6 +1,42 @@
-from marshmallow import Schema, fields, validate, pre_load, post_dump
+from functools import lru_cache
+from operator import attrgetter
+from marshmallow import EXCLUDE, Schema, fields, validate, pre_load, post_dump
 import json
 
+from app.models.models import Project
+
+
+@lru_cache(maxsize=4096)
+def _decode_images(images_json: str):
+    try:
+        return json.loads(images_json)
+    except Exception:
+        return []
+
+
+def decode_images(images_json):
+    """
+    Decoded `images_json`, cached by the column text itself, so a row is
+    only re-decoded when its images change.
+    """
+    if not images_json:
+        return []
+    images = _decode_images(images_json)
+    # Callers get their own list; the cached one is never handed out
+    return list(images) if isinstance(images, list) else images
+
+
+def project_images(project):
+    """
+    The API `images` value from the project_image rows (load them with
+    joinedload(Project.gallery)); rows that couldn't be normalized fall
+    back to decoding images_json.
+    """
+    gallery = project.gallery
+    if gallery:
+        return [image.url for image in gallery]
+    return decode_images(project.images_json)
+
 
 class ProjectListSchema(Schema):
     id = fields.Int()
@@ -14,12 +50,11 @@ class ProjectListSchema(Schema):
     images = fields.Method("get_images")
     repo_url = fields.Str(allow_none=True)
     live_url = fields.Str(allow_none=True)
+    comment_count = fields.Int()
+    last_comment_at = fields.DateTime(allow_none=True)
 
     def get_images(self, obj):
-        try:
-            return json.loads(obj.images_json) if obj.images_json else []
-        except Exception:
-            return []
+        return decode_images(obj.images_json)
 
 
 class CommentPublicSchema(Schema):
@@ -52,10 +87,7 @@ class ProjectDetailSchema(Schema):
     comments = fields.List(fields.Nested(CommentPublicSchema))
 
     def get_images(self, obj):
-        try:
-            return json.loads(obj.images_json) if obj.images_json else []
-        except Exception:
-            return []
+        return decode_images(obj.images_json)
 
 
 class CommentCreateSchema(Schema):
@@ -75,3 +107,52 @@ class CommentCreateSchema(Schema):
             if key in data and isinstance(data[key], str):
                 data[key] = data[key].strip()
         return data
+
+
+def _compile_list_dumper(schema_cls, model, methods):
+    """
+    Build a dumper for read-only list endpoints: one attrgetter pulls every
+    plain column at once and method fields are called directly, skipping
+    marshmallow's per-field dispatch. Fields the model doesn't have are
+    left out, exactly as marshmallow does.
+    """
+    names = [
+        name
+        for name in schema_cls._declared_fields
+        if name not in methods and name in model.__table__.columns
+    ]
+    get_columns = attrgetter(*names)
+    method_items = list(methods.items())
+
+    def dump(objs):
+        out = []
+        for obj in objs:
+            row = dict(zip(names, get_columns(obj)))
+            for name, fn in method_items:
+                row[name] = fn(obj)
+            out.append(row)
+        return out
+
+    return dump
+
+
+# Schemas are stateless between dumps, so one instance per module is enough
+project_list_schema = ProjectListSchema(many=True)
+project_detail_schema = ProjectDetailSchema(exclude=("comments",))
+comment_public_schema = CommentPublicSchema()
+comments_public_schema = CommentPublicSchema(many=True)
+comment_create_schema = CommentCreateSchema(unknown=EXCLUDE)
+
+
+def _last_comment_at(project):
+    # fields.DateTime's default (ISO 8601) format
+    value = project.last_comment_at
+    return value.isoformat() if value is not None else None
+
+
+# Same output as project_list_schema.dump() for the hot list endpoint
+dump_project_list = _compile_list_dumper(
+    ProjectListSchema,
+    Project,
+    {"images": project_images, "last_comment_at": _last_comment_at},
+)
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import click
+from sqlalchemy import DateTime, Integer, delete, func, insert, select
+
+from app.extensions import db, response_cache
+from app.models import Comment, ImportCheckpoint, Project, ProjectImage
+from app.models.models import image_urls_from_json, refresh_comment_stats
+
+IMPORT_KINDS = ("projects", "comments")
+DEFAULT_CHUNK_SIZE = 500
+
+
+class BulkImportError(ValueError):
+    pass
+
+
+# ---- readers ----
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[dict]:
+    """Stream dicts from a JSONL or CSV file (format from the extension by default)."""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt in ("jsonl", "ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise BulkImportError(f"{path}:{line_no}: invalid JSON ({e})")
+                if not isinstance(record, dict):
+                    raise BulkImportError(f"{path}:{line_no}: expected an object")
+                yield record
+    elif fmt == "csv":
+        with open(path, encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+    else:
+        raise BulkImportError(f"Unsupported import format: {fmt!r} (use jsonl or csv)")
+
+
+def _chunks(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---- row normalization ----
+
+
+def _coerce(table, record: dict) -> dict:
+    """Keep the table's columns and convert CSV strings to column types."""
+    row = {}
+    for column in table.columns:
+        if column.name not in record:
+            continue
+        value = record[column.name]
+        if isinstance(value, str):
+            if value == "" and column.nullable:
+                value = None
+            elif isinstance(column.type, Integer):
+                value = int(value)
+            elif isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+        row[column.name] = value
+    return row
+
+
+def _project_row(record: dict) -> dict:
+    record = dict(record)
+    # "images" may be given as a list (JSONL) instead of an images_json string
+    images = record.pop("images", None)
+    if images is not None and "images_json" not in record:
+        record["images_json"] = images if isinstance(images, str) else json.dumps(images)
+    row = _coerce(Project.__table__, record)
+    row.pop("id", None)
+    # Derived from the comment table, never taken from the input
+    row.pop("comment_count", None)
+    row.pop("last_comment_at", None)
+    # Upserts skip onupdate, so the timestamp is part of the row (DB clock)
+    row["updated_at"] = func.now()
+    if not row.get("slug") or not row.get("title"):
+        raise BulkImportError("project rows need slug and title")
+    return row
+
+
+# ---- dialect upserts ----
+
+
+def upsert_statement(table, rows: List[dict], conflict_columns: List[str]):
+    """
+    Multi-row INSERT that updates existing rows on a unique-key conflict:
+    ON DUPLICATE KEY UPDATE on MySQL, ON CONFLICT DO UPDATE on SQLite/PostgreSQL.
+    """
+    dialect = db.session.get_bind().dialect.name
+    update_columns = [c for c in rows[0] if c not in conflict_columns]
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+
+        stmt = dialect_insert(table).values(rows)
+        values = {c: stmt.inserted[c] for c in update_columns}
+        if not values:
+            # Nothing to update: re-assign the key to make the insert a no-op
+            values = {conflict_columns[0]: stmt.inserted[conflict_columns[0]]}
+        return stmt.on_duplicate_key_update(**values)
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        stmt = dialect_insert(table).values(rows)
+        if not update_columns:
+            return stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={c: stmt.excluded[c] for c in update_columns},
+        )
+    raise BulkImportError(f"Bulk upsert is not supported on {dialect}")
+
+
+def _group_by_columns(rows: List[dict]) -> Iterator[List[dict]]:
+    # A multi-row VALUES needs the same columns in every row; rows that
+    # leave columns out must not overwrite them with NULL
+    groups: Dict[tuple, List[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return iter(groups.values())
+
+
+def _upsert_grouped(table, rows: List[dict], conflict_columns: List[str]) -> None:
+    for group in _group_by_columns(rows):
+        db.session.execute(upsert_statement(table, group, conflict_columns))
+
+
+def upsert_projects(records: List[dict]) -> int:
+    """
+    Upsert project rows by slug in one statement, then rebuild the
+    project_image rows of projects whose images_json was given (bulk
+    statements skip the ORM flush hook that normally keeps them in sync).
+    """
+    rows = [_project_row(r) for r in records]
+    if not rows:
+        return 0
+    # Last occurrence of a slug wins, as with sequential updates
+    rows = list({row["slug"]: row for row in rows}.values())
+    _upsert_grouped(Project.__table__, rows, ["slug"])
+
+    with_images = {row["slug"]: row["images_json"] for row in rows if "images_json" in row}
+    if with_images:
+        ids = dict(
+            db.session.execute(
+                select(Project.slug, Project.id).where(Project.slug.in_(list(with_images)))
+            ).all()
+        )
+        db.session.execute(
+            delete(ProjectImage).where(ProjectImage.project_id.in_(list(ids.values())))
+        )
+        images = [
+            {"project_id": ids[slug], "position": position, "url": url}
+            for slug, images_json in with_images.items()
+            for position, url in enumerate(image_urls_from_json(images_json) or [])
+        ]
+        if images:
+            db.session.execute(insert(ProjectImage), images)
+    return len(rows)
+
+
+def _comment_import_key(row: dict) -> str:
+    # Natural key of a comment without an id: where, who, when and what
+    created_at = row.get("created_at")
+    digest = hashlib.blake2b(digest_size=16)
+    for value in (
+        row["project_id"],
+        row["name"],
+        row["email"],
+        created_at.isoformat() if created_at else "",
+        row["content"],
+    ):
+        digest.update(str(value).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def import_comments(records: List[dict]) -> int:
+    """
+    Upsert comments; rows reference their project by project_slug or
+    project_id. Rows with an explicit id are upserted on it, rows without
+    one on a hash of (project, name, email, created_at, content), so
+    re-running an import never duplicates comments. Returns the number of
+    rows written.
+    """
+    slugs = {r["project_slug"] for r in records if r.get("project_slug")}
+    ids = (
+        dict(
+            db.session.execute(
+                select(Project.slug, Project.id).where(Project.slug.in_(list(slugs)))
+            ).all()
+        )
+        if slugs
+        else {}
+    )
+    with_id, without_id = [], []
+    for record in records:
+        row = _coerce(Comment.__table__, record)
+        if record.get("project_slug"):
+            row["project_id"] = ids.get(record["project_slug"])
+        if row.get("project_id") is None:
+            raise BulkImportError(f"unknown project for comment: {record!r}")
+        for field in ("name", "email", "content"):
+            if not row.get(field):
+                raise BulkImportError(f"comment rows need {field}")
+        if row.get("id") is not None:
+            row.pop("import_key", None)
+            with_id.append(row)
+        else:
+            row["import_key"] = _comment_import_key(row)
+            without_id.append(row)
+    # One row per key: a multi-row upsert may not touch the same row twice
+    without_id = list({row["import_key"]: row for row in without_id}.values())
+
+    touched = {row["project_id"] for row in with_id + without_id}
+    if with_id:
+        # An upsert may move an existing comment to another project
+        touched.update(
+            db.session.scalars(
+                select(Comment.project_id).where(Comment.id.in_([row["id"] for row in with_id]))
+            )
+        )
+        _upsert_grouped(Comment.__table__, with_id, ["id"])
+    if without_id:
+        _upsert_grouped(Comment.__table__, without_id, ["import_key"])
+    # Bulk statements skip the ORM hook that maintains the Project comment stats
+    refresh_comment_stats(db.session, touched)
+    return len(with_id) + len(without_id)
+
+
+IMPORTERS: Dict[str, Callable[[List[dict]], int]] = {
+    "projects": upsert_projects,
+    "comments": import_comments,
+}
+
+
+# ---- resumable runs ----
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class Checkpoint:
+    """
+    Progress of an import in the import_checkpoint table: the number of
+    records already committed. save() runs in the chunk's transaction, so
+    the checkpoint can never lag behind or run ahead of the data. It is
+    only trusted while the input file is unchanged (same size and mtime),
+    and removed once the import finishes.
+    """
+
+    def __init__(self, path: str, kind: str):
+        self.path = os.path.abspath(path)
+        self.key = hashlib.blake2b(self.path.encode("utf-8"), digest_size=16).hexdigest()
+        stat = os.stat(path)
+        self.identity = {"kind": kind, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def load(self) -> int:
+        state = db.session.get(ImportCheckpoint, self.key)
+        if state is None:
+            return 0
+        if {"kind": state.kind, "size": state.size, "mtime_ns": state.mtime_ns} != self.identity:
+            return 0
+        return state.committed
+
+    def save(self, committed: int) -> None:
+        """Stage the new position; the caller commits it with the chunk."""
+        row = {"input_key": self.key, "path": self.path, "committed": committed, **self.identity}
+        db.session.execute(upsert_statement(ImportCheckpoint.__table__, [row], ["input_key"]))
+
+    def clear(self) -> None:
+        db.session.execute(delete(ImportCheckpoint).where(ImportCheckpoint.input_key == self.key))
+        db.session.commit()
+
+
+def run_import(
+    kind: str,
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    progress: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """
+    Import `path` in chunks of `chunk_size`, one transaction per chunk.
+    After an interruption, a re-run skips the records committed before it.
+    """
+    importer = IMPORTERS[kind]
+    checkpoint = Checkpoint(path, kind)
+    done = checkpoint.load() if resume else 0
+    stats = ImportStats(skipped=done)
+    start = time.perf_counter()
+
+    records = iter_records(path, fmt)
+    for _ in range(done):
+        next(records, None)
+
+    for chunk in _chunks(records, chunk_size):
+        try:
+            stats.rows += importer(chunk)
+            checkpoint.save(done + len(chunk))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        done += len(chunk)
+        stats.chunks += 1
+        stats.seconds = time.perf_counter() - start
+        if progress:
+            progress(stats)
+
+    stats.seconds = time.perf_counter() - start
+    checkpoint.clear()
+    if stats.rows:
+        # Invalidate cached project responses in every worker sharing the cache backend
+        response_cache.bump_version(projects=kind == "projects")
+    return stats
+
+
+def register_import_commands(app):
+    @app.cli.command("import-data")
+    @click.argument("kind", type=click.Choice(IMPORT_KINDS))
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(["jsonl", "csv"]), default=None,
+                  help="Input format (default: from the file extension).")
+    @click.option("--chunk-size", default=DEFAULT_CHUNK_SIZE, show_default=True, type=click.IntRange(1))
+    @click.option("--restart", is_flag=True, help="Ignore a previous checkpoint and start over.")
+    def import_data_command(kind, path, fmt, chunk_size, restart):
+        """Bulk upsert projects or comments from a JSONL/CSV file."""
+
+        def report(stats: ImportStats) -> None:
+            click.echo(
+                f"  chunk {stats.chunks}: {stats.rows} rows "
+                f"({stats.rows_per_second:.0f} rows/s)"
+            )
+
+        try:
+            stats = run_import(kind, path, fmt, chunk_size, resume=not restart, progress=report)
+        except ValueError as e:
+            raise click.ClickException(f"Import stopped: {e} (re-run to resume)")
+        if stats.skipped:
+            click.echo(f"Resumed after {stats.skipped} already imported records")
+        click.echo(
+            f"Imported {stats.rows} {kind} in {stats.chunks} chunks, "
+            f"{stats.seconds:.2f}s ({stats.rows_per_second:.0f} rows/s)"
+        )
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
+
+# Counters kept by the shared backends: any catalog write bumps the first,
+# writes to project rows also bump the second (the search index follows it)
+CATALOG_VERSION = "catalog_version"
+PROJECTS_VERSION = "projects_version"
+
+# Distinguishes this boot from earlier processes that reused the same pid
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    version: Union[int, str]
+    expires_at: float
+    etag: str = ""
+    # When the data in the body last changed (from the rows), if known
+    last_modified: Optional[datetime] = None
+    # Compressed copies of body by Content-Encoding, filled on first use
+    encoded: Dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        # Computed once per entry so conditional GETs never re-hash the body
+        if not self.etag:
+            self.etag = content_etag(self.body)
+
+
+def content_etag(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+# Shared-store values carry Last-Modified ahead of the body: magic + float seconds
+_LM_MAGIC = b"\x00LM"
+_LM_STRUCT = struct.Struct("!d")
+
+
+def _pack(body: bytes, last_modified: Optional[datetime]) -> bytes:
+    if last_modified is None:
+        return body
+    seconds = last_modified.replace(tzinfo=timezone.utc).timestamp()
+    return _LM_MAGIC + _LM_STRUCT.pack(seconds) + body
+
+
+def _unpack(value: bytes):
+    if not value.startswith(_LM_MAGIC):
+        return value, None
+    offset = len(_LM_MAGIC)
+    (seconds,) = _LM_STRUCT.unpack_from(value, offset)
+    last_modified = datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+    return value[offset + _LM_STRUCT.size :], last_modified
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU with a per-entry TTL (one instance per worker)."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(
+        self, key: str, body: bytes, version: Union[int, str], last_modified: Optional[datetime] = None
+    ) -> CacheEntry:
+        entry = CacheEntry(
+            body, version, time.monotonic() + self.ttl, last_modified=last_modified
+        )
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCacheBackend:
+    """Shared store for all workers on one host (a single SQLite file in WAL mode)."""
+
+    # Expired rows are deleted at most this often (seconds, per process)
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._next_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Connections are per thread and per process (never shared across a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = (
+            self._conn()
+            .execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+        # Periodic cleanup keeps the file from growing without bound
+        with self._sweep_lock:
+            due = time.monotonic() >= self._next_sweep
+            if due:
+                self._next_sweep = time.monotonic() + self.SWEEP_INTERVAL
+        if due:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def get_version(self, name: str = CATALOG_VERSION) -> int:
+        row = (
+            self._conn()
+            .execute("SELECT value FROM meta WHERE name = ?", (name,))
+            .fetchone()
+        )
+        return int(row[0]) if row else 0
+
+    def bump_version(self, name: str = CATALOG_VERSION) -> int:
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO meta (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+        return self.get_version(name)
+
+
+class RedisCacheBackend:
+    """Shared store backed by any Redis-compatible server (requires `redis`)."""
+
+    def __init__(self, url: str, prefix: str = "personal-site:"):
+        import redis  # optional dependency, only needed when configured
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    def get_version(self, name: str = CATALOG_VERSION) -> int:
+        value = self.client.get(self.prefix + name)
+        return int(value) if value else 0
+
+    def bump_version(self, name: str = CATALOG_VERSION) -> int:
+        return int(self.client.incr(self.prefix + name))
+
+
+def make_shared_backend(url: str):
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        # sqlite:///relative/path.db or sqlite:////absolute/path.db
+        return SQLiteCacheBackend(url[len("sqlite:///") :])
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisCacheBackend(url)
+    raise ValueError(f"Unsupported RESPONSE_CACHE_SHARED_URL scheme: {parsed.scheme}")
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON response bodies.
+
+    Entries are tagged with the catalog version; any write to the catalog
+    (new comment, seeding) bumps the version, which invalidates every entry
+    at once in all workers sharing the same backend. Writes that change
+    project rows (not just comments) also bump `projects_version()`.
+
+    Shared-store failures are logged and counted. While the store is down,
+    versions come from a per-process namespace ("local:<pid>:<boot>:<n>")
+    that can never equal a number the shared store has issued.
+    """
+
+    # Log a failing shared store at most this often (seconds); every failure is counted
+    ERROR_LOG_INTERVAL = 60.0
+
+    def __init__(self):
+        self.enabled = False
+        self.lru = LRUCache()
+        self.shared = None
+        self._local_version = 0
+        self._local_projects_version = 0
+        self._version_lock = threading.Lock()
+        self._errors: Dict[str, int] = {}
+        self._next_error_log = 0.0
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RESPONSE_CACHE_ENABLED", True)
+        self.lru = LRUCache(
+            max_entries=app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 256),
+            ttl=app.config.get("RESPONSE_CACHE_TTL", 300),
+        )
+        self.shared = make_shared_backend(
+            app.config.get("RESPONSE_CACHE_SHARED_URL", "")
+        )
+        app.extensions["response_cache"] = self
+
+    def _shared_failed(self, op: str, error: Exception) -> None:
+        with self._version_lock:
+            self._errors[op] = self._errors.get(op, 0) + 1
+            now = time.monotonic()
+            log = now >= self._next_error_log
+            if log:
+                self._next_error_log = now + self.ERROR_LOG_INTERVAL
+        if log:
+            logger.warning("[response-cache] shared store %s failed: %s", op, error)
+
+    def _fallback(self, counter: int) -> str:
+        return f"local:{os.getpid()}:{_BOOT_ID}:{counter}"
+
+    def version(self) -> Union[int, str]:
+        if self.shared is None:
+            return self._local_version
+        try:
+            return self.shared.get_version()
+        except Exception as e:
+            self._shared_failed("get_version", e)
+            return self._fallback(self._local_version)
+
+    def projects_version(self) -> Union[int, str]:
+        if self.shared is None:
+            return self._local_projects_version
+        try:
+            return self.shared.get_version(PROJECTS_VERSION)
+        except Exception as e:
+            self._shared_failed("get_version", e)
+            return self._fallback(self._local_projects_version)
+
+    def bump_version(self, projects: bool = True) -> Union[int, str]:
+        """
+        Invalidate every cached response. Pass projects=False for writes
+        that leave project rows alone (comments), so the search index is
+        not rebuilt.
+        """
+        with self._version_lock:
+            self._local_version += 1
+            if projects:
+                self._local_projects_version += 1
+        self.lru.clear()
+        if self.shared is not None:
+            try:
+                if projects:
+                    self.shared.bump_version(PROJECTS_VERSION)
+                return self.shared.bump_version()
+            except Exception as e:
+                self._shared_failed("bump_version", e)
+                return self._fallback(self._local_version)
+        return self._local_version
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        if not self.enabled:
+            return None
+        version = self.version()
+        entry = self.lru.get(key)
+        if entry is not None and entry.version == version:
+            return entry
+        if self.shared is not None:
+            try:
+                value = self.shared.get(f"{version}:{key}")
+            except Exception as e:
+                self._shared_failed("get", e)
+                value = None
+            if value is not None:
+                body, last_modified = _unpack(value)
+                return self.lru.set(key, body, version, last_modified)
+        return None
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        version: Union[int, str, None] = None,
+        last_modified: Optional[datetime] = None,
+    ) -> CacheEntry:
+        """Cache `body`; `last_modified` (naive UTC) is when its data last changed."""
+        if version is None:
+            version = self.version()
+        if not self.enabled:
+            return CacheEntry(body, version, time.monotonic(), last_modified=last_modified)
+        if self.shared is not None:
+            try:
+                self.shared.set(f"{version}:{key}", _pack(body, last_modified), self.lru.ttl)
+            except Exception as e:
+                self._shared_failed("set", e)
+        return self.lru.set(key, body, version, last_modified)
+
+    def collect_metrics(self, registry) -> None:
+        """Copy counters into a MetricsRegistry (see services/metrics.py)."""
+        with self._version_lock:
+            errors = dict(self._errors)
+        for op, value in errors.items():
+            registry.set_counter("response_cache_shared_errors_total", value, op=op)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc as sa_exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.services.metrics import metrics
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            metrics.inc("db_pool_timeouts_total")
+            raise
+        finally:
+            metrics.observe("db_pool_wait_seconds", time.perf_counter() - start)
+
+
+def build_engine_options(cfg) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings in Config.
+
+    The pool is per process (each gunicorn worker has its own), so DB_POOL_SIZE
+    should cover the worker's concurrent requests (GUNICORN_THREADS) plus the
+    outbox thread; workers x (size + overflow) must stay under max_connections.
+    """
+    uri = cfg.get("SQLALCHEMY_DATABASE_URI")
+    if not uri:
+        return {}
+    url = make_url(uri)
+    options = {"pool_pre_ping": cfg.get("DB_POOL_PRE_PING", True)}
+
+    backend = url.get_backend_name()
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a singleton pool; sizing options don't apply
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=cfg.get("DB_POOL_SIZE", 5),
+        max_overflow=cfg.get("DB_MAX_OVERFLOW", 5),
+        pool_timeout=cfg.get("DB_POOL_TIMEOUT", 10),
+        # Recycle below MySQL's wait_timeout so idle connections are never stale
+        pool_recycle=cfg.get("DB_POOL_RECYCLE", 280),
+        # LIFO keeps a few hot connections busy and lets the rest idle out
+        pool_use_lifo=True,
+    )
+    if backend == "mysql":
+        connect_args = {
+            "connect_timeout": cfg.get("DB_CONNECT_TIMEOUT", 5),
+            "read_timeout": cfg.get("DB_READ_TIMEOUT", 30),
+            "write_timeout": cfg.get("DB_WRITE_TIMEOUT", 30),
+        }
+        statement_timeout = cfg.get("DB_STATEMENT_TIMEOUT_MS", 0)
+        if statement_timeout:
+            # Server-side cap for read-only SELECTs (MySQL 5.7.8+)
+            connect_args["init_command"] = (
+                f"SET SESSION max_execution_time={int(statement_timeout)}"
+            )
+        options["connect_args"] = connect_args
+    return options
+
+
+class PoolMonitor:
+    """
+    Tracks the app's engines: disposes inherited pools after fork and
+    exposes pool utilization to /metrics.
+    """
+
+    def __init__(self):
+        self._engines: Dict[Optional[str], Engine] = {}
+        self._fork_hook_registered = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db) -> None:
+        with app.app_context():
+            engines = dict(db.engines)
+        with self._lock:
+            self._engines.update(engines)
+            if not self._fork_hook_registered:
+                os.register_at_fork(after_in_child=self._after_fork)
+                self._fork_hook_registered = True
+        app.extensions["pool_monitor"] = self
+
+    def _after_fork(self) -> None:
+        # Sockets inherited from the parent must not be used (or closed) by
+        # the child; close=False just drops them and starts a fresh pool.
+        for engine in list(self._engines.values()):
+            engine.dispose(close=False)
+
+    def stats(self) -> dict:
+        result = {}
+        for bind, engine in list(self._engines.items()):
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            result[bind or "default"] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        return result
+
+    def collect_metrics(self, registry) -> None:
+        """Copy pool gauges into a MetricsRegistry (see services/metrics.py)."""
+        for bind, snap in self.stats().items():
+            for field, value in snap.items():
+                registry.set_gauge(f"db_pool_{field}", value, bind=bind, pid=os.getpid())
+
+
+pool_monitor = PoolMonitor()
+
+
+@event.listens_for(Pool, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    # Includes stale connections caught by pool_pre_ping
+    metrics.inc("db_pool_invalidations_total")
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import threading
+import time
+from functools import wraps
+from typing import Dict, Optional
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.services.metrics import metrics
+from app.utils.client_ip import client_ip
+
+REPLICA_BIND = "replica"
+STICKY_COOKIE = "db_primary_until"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the "replica" bind while a request is
+    marked with `replica_reads`. Flushes (writes) always use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and has_request_context()
+            and g.get("_db_use_replica")
+        ):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _client_key() -> str:
+    return client_ip() or "-"
+
+
+class ReplicaRouter:
+    """
+    Decides per request whether reads may go to the replica.
+
+    - Disabled unless DATABASE_REPLICA_URL is set.
+    - After a client writes, its reads stay on the primary for
+      REPLICA_STICKY_SECONDS (cookie for same-site clients, plus an entry
+      keyed by client IP in the response cache's shared store, so a
+      cross-origin fetch without cookies that lands on another worker is
+      covered too; an in-process map when no shared store is configured).
+    - For the same window after the catalog version changes (any write, in
+      any worker), all reads use the primary so the response cache is not
+      refilled from a lagging replica.
+    - A connection error on the replica marks it down for
+      REPLICA_RETRY_SECONDS; the failed read is retried on the primary.
+    """
+
+    MAX_STICKY_CLIENTS = 10_000
+
+    def __init__(self):
+        self.db = None
+        self.enabled = False
+        self.sticky_seconds = 5.0
+        self.retry_seconds = 30.0
+        self._down_until = 0.0
+        self._catalog_version = None
+        self._seen_version = None
+        self._version_changed_at = float("-inf")
+        self._sticky: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.shared = None
+
+    def init_app(self, app, db, catalog_version=None, shared=None) -> None:
+        self.db = db
+        self._catalog_version = catalog_version
+        # Key/value store with TTLs shared by all workers (services/cache.py backends)
+        self.shared = shared
+        self.enabled = bool(app.config.get("SQLALCHEMY_BINDS", {}).get(REPLICA_BIND))
+        self.sticky_seconds = app.config.get("REPLICA_STICKY_SECONDS", 5.0)
+        self.retry_seconds = app.config.get("REPLICA_RETRY_SECONDS", 30.0)
+        app.extensions["replica_router"] = self
+
+        @app.after_request
+        def _set_sticky_cookie(response):
+            until = g.get("_db_sticky_until")
+            if until:
+                response.set_cookie(
+                    STICKY_COOKIE,
+                    str(int(until)),
+                    max_age=int(self.sticky_seconds) + 1,
+                    httponly=True,
+                    samesite="Lax",
+                    secure=request.is_secure,
+                )
+            return response
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def mark_down(self, error: Exception) -> None:
+        self._down_until = time.monotonic() + self.retry_seconds
+        metrics.inc("db_replica_fallbacks_total")
+
+    def stick_to_primary(self) -> None:
+        """Call after a committed write by the current client."""
+        if not self.enabled:
+            return
+        now = time.time()
+        until = now + self.sticky_seconds
+        key = _client_key()
+        with self._lock:
+            if len(self._sticky) >= self.MAX_STICKY_CLIENTS:
+                self._sticky = {k: v for k, v in self._sticky.items() if v > now}
+            self._sticky[key] = until
+        if self.shared is not None:
+            try:
+                self.shared.set(f"{STICKY_COOKIE}:{key}", b"1", self.sticky_seconds)
+            except Exception as e:
+                current_app.logger.warning("Could not share primary stickiness: %s", e)
+        g._db_sticky_until = until
+
+    def is_sticky(self) -> bool:
+        now = time.time()
+        try:
+            if float(request.cookies.get(STICKY_COOKIE, 0)) > now:
+                return True
+        except ValueError:
+            pass
+        key = _client_key()
+        with self._lock:
+            if self._sticky.get(key, 0) > now:
+                return True
+        if self.shared is not None:
+            try:
+                return self.shared.get(f"{STICKY_COOKIE}:{key}") is not None
+            except Exception:
+                # Can't tell: stay on the primary
+                return True
+        return False
+
+    def catalog_settling(self) -> bool:
+        if self._catalog_version is None:
+            return False
+        version = self._catalog_version()
+        now = time.monotonic()
+        if version != self._seen_version:
+            if self._seen_version is not None:
+                self._version_changed_at = now
+            self._seen_version = version
+        return now - self._version_changed_at < self.sticky_seconds
+
+    def use_replica(self) -> bool:
+        return (
+            self.enabled
+            and self.healthy
+            and not self.is_sticky()
+            and not self.catalog_settling()
+        )
+
+    def replica_status(self) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        return {"healthy": self.healthy}
+
+
+replica_router = ReplicaRouter()
+
+
+def replica_reads(view):
+    """
+    Run a read-only view against the replica when allowed, falling back to
+    the primary if the replica connection fails.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not replica_router.use_replica():
+            return view(*args, **kwargs)
+        g._db_use_replica = True
+        try:
+            return view(*args, **kwargs)
+        except (OperationalError, InterfaceError) as e:
+            current_app.logger.warning("Replica read failed, using primary: %s", e)
+            replica_router.db.session.rollback()
+            replica_router.mark_down(e)
+            g._db_use_replica = False
+            return view(*args, **kwargs)
+        finally:
+            g._db_use_replica = False
+
+    return wrapper
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from flask import current_app
 from markupsafe import escape
-import requests
+
+from app.services.http_client import http_client
 
 BREVO_ENDPOINT = "https://api.brevo.com/v3/smtp/email"
 
@@ -50,7 +51,8 @@ def send_contact_email(*, name: str, email: str, message: str) -> None:
     }
 
     current_app.logger.info("[email] Sending via Brevo API...")
-    resp = requests.post(BREVO_ENDPOINT, json=payload, headers=headers, timeout=10)
+    endpoint = current_app.config.get("BREVO_API_URL") or BREVO_ENDPOINT
+    resp = http_client.post("brevo", endpoint, json=payload, headers=headers)
     if resp.status_code >= 400:
         current_app.logger.error(
             "[email] Brevo error %s: %s", resp.status_code, resp.text[:500]
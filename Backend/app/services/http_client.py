@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+# Upper bounds (ms) of the per-provider latency histogram buckets
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without touching the network while a provider's circuit is open."""
+
+
+def _never_sent(error: requests.ConnectionError) -> bool:
+    """True when the connection could not be opened, so the request never left."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    # urllib3's NewConnectionError (refused, DNS failure) is a ConnectTimeoutError
+    return isinstance(reason, ConnectTimeoutError)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker: after `threshold` failures the circuit opens
+    for `cooldown` seconds, then a single trial call decides whether it closes.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                raise CircuitOpenError("circuit open")
+            if state == "half_open":
+                self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class ProviderStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def observe(self, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += 0 if ok else 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "short_circuited": self.short_circuited,
+                "total_ms": round(self.total_ms, 3),
+                "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+                "max_ms": round(self.max_ms, 2),
+                "buckets_ms": dict(
+                    zip([str(b) for b in LATENCY_BUCKETS_MS] + ["+Inf"], self.buckets)
+                ),
+            }
+
+
+class HttpClient:
+    """
+    Outbound HTTP client shared by captcha verification and Brevo email.
+
+    One pooled keep-alive `requests.Session` per worker process, with
+    connect/read timeouts, retries with jittered backoff, a circuit breaker
+    and latency stats per provider.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self):
+        self.pool_size = 10
+        self.connect_timeout = 3.0
+        self.read_timeout = 10.0
+        self.retries = 2
+        self.backoff = 0.2
+        self.breaker_threshold = 5
+        self.breaker_cooldown = 30.0
+        self._session: Optional[requests.Session] = None
+        self._pid: Optional[int] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        cfg = app.config
+        self.pool_size = cfg.get("HTTP_POOL_SIZE", 10)
+        self.connect_timeout = cfg.get("HTTP_CONNECT_TIMEOUT", 3.0)
+        self.read_timeout = cfg.get("HTTP_READ_TIMEOUT", 10.0)
+        self.retries = cfg.get("HTTP_RETRIES", 2)
+        self.backoff = cfg.get("HTTP_RETRY_BACKOFF", 0.2)
+        self.breaker_threshold = cfg.get("HTTP_BREAKER_THRESHOLD", 5)
+        self.breaker_cooldown = cfg.get("HTTP_BREAKER_COOLDOWN", 30.0)
+        app.extensions["http_client"] = self
+
+    @property
+    def session(self) -> requests.Session:
+        # Never reuse pooled sockets inherited across a gunicorn fork
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_size, pool_maxsize=self.pool_size
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+                    self._pid = os.getpid()
+        return self._session
+
+    def breaker(
+        self,
+        provider: str,
+        threshold: Optional[int] = None,
+        cooldown: Optional[float] = None,
+    ) -> CircuitBreaker:
+        """The provider's breaker; threshold/cooldown apply when it is first created."""
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(
+                    threshold or self.breaker_threshold, cooldown or self.breaker_cooldown
+                )
+            return self._breakers[provider]
+
+    def provider_stats(self, provider: str) -> ProviderStats:
+        with self._lock:
+            if provider not in self._stats:
+                self._stats[provider] = ProviderStats()
+            return self._stats[provider]
+
+    def stats(self) -> dict:
+        with self._lock:
+            providers = list(self._stats.items())
+        return {
+            name: {**stats.snapshot(), "circuit": self.breaker(name).state}
+            for name, stats in providers
+        }
+
+    def collect_metrics(self, registry) -> None:
+        """Copy per-provider stats into a MetricsRegistry (see services/metrics.py)."""
+        bounds = [b / 1000 for b in LATENCY_BUCKETS_MS]
+        for provider, snap in self.stats().items():
+            registry.set_counter("outbound_http_requests_total", snap["requests"], provider=provider)
+            registry.set_counter("outbound_http_errors_total", snap["errors"], provider=provider)
+            registry.set_counter("outbound_http_retries_total", snap["retries"], provider=provider)
+            registry.set_counter(
+                "outbound_http_short_circuited_total", snap["short_circuited"], provider=provider
+            )
+            registry.set_histogram(
+                "outbound_http_duration_seconds",
+                bounds,
+                list(snap["buckets_ms"].values()),
+                snap["total_ms"] / 1000,
+                provider=provider,
+            )
+            registry.set_gauge(
+                "outbound_http_circuit_open",
+                0 if snap["circuit"] == "closed" else 1,
+                provider=provider,
+                pid=os.getpid(),
+            )
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+    def post(
+        self,
+        provider: str,
+        url: str,
+        timeout=None,
+        retries: Optional[int] = None,
+        validate: Optional[Callable[[requests.Response], bool]] = None,
+        idempotent: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        POST via the shared pool, retrying up to `retries` times (HTTP_RETRIES
+        by default) when the connection could not be opened. Dropped
+        connections and 502/503/504 are retried only for `idempotent` calls:
+        they do not mean the provider did not act (an email may already be
+        sent), and read timeouts are never retried for the same reason. A response that `validate` rejects counts
+        as a failure for the breaker.
+        """
+        breaker = self.breaker(provider)
+        stats = self.provider_stats(provider)
+        timeout = timeout or (self.connect_timeout, self.read_timeout)
+        retries = self.retries if retries is None else retries
+
+        attempt = 0
+        while True:
+            try:
+                breaker.before_call()
+            except CircuitOpenError:
+                stats.incr("short_circuited")
+                raise CircuitOpenError(f"{provider} circuit is open")
+
+            start = time.perf_counter()
+            try:
+                resp = self.session.post(url, timeout=timeout, **kwargs)
+            except requests.ConnectionError as e:
+                stats.observe((time.perf_counter() - start) * 1000, ok=False)
+                breaker.record_failure()
+                if attempt < retries and (idempotent or _never_sent(e)):
+                    attempt += 1
+                    stats.incr("retries")
+                    self._sleep_before_retry(attempt)
+                    continue
+                raise
+            except requests.RequestException:
+                stats.observe((time.perf_counter() - start) * 1000, ok=False)
+                breaker.record_failure()
+                raise
+
+            ok = resp.status_code < 500 and (validate is None or validate(resp))
+            stats.observe((time.perf_counter() - start) * 1000, ok=ok)
+            if ok:
+                breaker.record_success()
+                return resp
+            breaker.record_failure()
+            if idempotent and resp.status_code in self.RETRY_STATUSES and attempt < retries:
+                attempt += 1
+                stats.incr("retries")
+                self._sleep_before_retry(attempt)
+                continue
+            return resp
+
+
+http_client = HttpClient()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import List
+
+import bleach
+from markdown_it import MarkdownIt
+
+from app.services.cache import LRUCache, content_etag
+
+ALLOWED_TAGS = {
+    "a", "abbr", "b", "blockquote", "br", "code", "del", "em", "h1", "h2",
+    "h3", "h4", "h5", "h6", "hr", "i", "img", "li", "ol", "p", "pre", "s",
+    "strong", "table", "tbody", "td", "th", "thead", "tr", "ul",
+}
+ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title"],
+    "img": ["src", "alt", "title"],
+    "code": ["class"],
+    **{f"h{level}": ["id"] for level in range(1, 7)},
+}
+ALLOWED_PROTOCOLS = {"http", "https", "mailto"}
+
+EXCERPT_LENGTH = 200
+
+_slug_strip_re = re.compile(r"[^\w\s-]", re.UNICODE)
+_slug_space_re = re.compile(r"[\s_-]+")
+_ws_re = re.compile(r"\s+")
+
+# Raw HTML in descriptions is escaped by the parser; bleach is the second line
+_md = MarkdownIt("commonmark", {"html": False, "linkify": False}).enable("table")
+
+
+@dataclass
+class RenderedMarkdown:
+    html: str
+    excerpt: str
+    toc: List[dict] = field(default_factory=list)
+
+
+def _slugify(text: str) -> str:
+    slug = _slug_strip_re.sub("", text.lower())
+    return _slug_space_re.sub("-", slug).strip("-") or "section"
+
+
+def _excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    text = _ws_re.sub(" ", text).strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0].rstrip(" ,.;:-")
+    return f"{cut}…"
+
+
+def _inline_text(token) -> str:
+    parts = []
+    for child in token.children or []:
+        if child.type in ("text", "code_inline"):
+            parts.append(child.content)
+        elif child.type in ("softbreak", "hardbreak"):
+            # A line break inside a paragraph still separates words
+            parts.append(" ")
+    return _ws_re.sub(" ", "".join(parts)).strip()
+
+
+def render_markdown(source: str) -> RenderedMarkdown:
+    """
+    Markdown -> sanitized HTML, with heading anchors, a table of contents
+    and a plain-text excerpt taken from the paragraphs.
+    """
+    env: dict = {}
+    tokens = _md.parse(source or "", env)
+
+    toc = []
+    used_ids: dict = {}
+    paragraphs = []
+    for i, token in enumerate(tokens):
+        if token.type == "heading_open":
+            text = _inline_text(tokens[i + 1]) if i + 1 < len(tokens) else ""
+            slug = _slugify(text)
+            count = used_ids.get(slug, 0)
+            used_ids[slug] = count + 1
+            anchor = slug if count == 0 else f"{slug}-{count + 1}"
+            token.attrSet("id", anchor)
+            toc.append({"level": int(token.tag[1]), "text": text, "id": anchor})
+        elif token.type == "inline" and i > 0 and tokens[i - 1].type == "paragraph_open":
+            paragraphs.append(_inline_text(token))
+
+    html = bleach.clean(
+        _md.renderer.render(tokens, _md.options, env),
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True,
+    )
+    return RenderedMarkdown(html=html, excerpt=_excerpt(" ".join(paragraphs)), toc=toc)
+
+
+class MarkdownCache:
+    """
+    Rendered descriptions keyed by a hash of the markdown, so a description
+    is rendered once per content version and survives catalog version bumps
+    (e.g. new comments) that invalidate the response cache.
+    """
+
+    def __init__(self):
+        self.cache = LRUCache(max_entries=512, ttl=24 * 3600)
+
+    def init_app(self, app) -> None:
+        self.cache.max_entries = app.config.get("MARKDOWN_CACHE_MAX_ENTRIES", 512)
+        app.extensions["markdown_cache"] = self
+
+    def render(self, source: str) -> RenderedMarkdown:
+        key = content_etag((source or "").encode("utf-8"))
+        entry = self.cache.get(key)
+        if entry is not None:
+            return RenderedMarkdown(**json.loads(entry.body))
+        rendered = render_markdown(source)
+        self.cache.set(key, json.dumps(asdict(rendered)).encode("utf-8"), 0)
+        return rendered
+
+
+markdown_cache = MarkdownCache()
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram bucket upper bounds, in seconds unless the name says otherwise
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+HELP = {
+    "http_requests_total": "HTTP requests handled, by endpoint/method/status.",
+    "http_request_duration_seconds": "HTTP request latency.",
+    "db_queries_per_request": "SQL statements executed per HTTP request.",
+    "db_query_duration_seconds": "SQL statement latency.",
+    "db_time_per_request_seconds": "Time spent in SQL per HTTP request.",
+    "db_queries_total": "SQL statements executed (including background work).",
+    "db_pool_size": "Configured pool size, per worker.",
+    "db_pool_checked_out": "Connections currently checked out, per worker.",
+    "db_pool_checked_in": "Idle connections in the pool, per worker.",
+    "db_pool_overflow": "Connections opened beyond pool_size, per worker.",
+    "db_pool_wait_seconds": "Time spent waiting for a pooled connection.",
+    "db_pool_timeouts_total": "Connection checkouts that hit DB_POOL_TIMEOUT.",
+    "db_pool_invalidations_total": "Connections discarded (stale, failed pre-ping, errors).",
+    "db_replica_fallbacks_total": "Reads retried on the primary after a replica error.",
+    "rate_limit_rejections_total": "Requests rejected by the rate limiter.",
+    "outbound_http_requests_total": "Outbound HTTP calls, by provider.",
+    "outbound_http_errors_total": "Failed outbound HTTP calls, by provider.",
+    "outbound_http_retries_total": "Outbound HTTP retries, by provider.",
+    "outbound_http_short_circuited_total": "Outbound HTTP calls refused by an open circuit.",
+    "outbound_http_duration_seconds": "Outbound HTTP latency, by provider.",
+    "outbound_http_circuit_open": "1 while the provider's circuit breaker is not closed.",
+    "captcha_events_total": "Captcha verification cache and provider outcomes.",
+    "write_buffer_rows_total": "Rows committed by the write buffer.",
+    "response_cache_shared_errors_total": "Failed shared response-cache operations, by op.",
+    "write_buffer_batches_total": "Write buffer flushes (one transaction each).",
+    "write_buffer_failed_rows_total": "Buffered rows that could not be inserted.",
+    "write_buffer_rejections_total": "Writes refused because the buffer was full.",
+    "write_buffer_pending": "Rows queued and not yet flushed, per worker.",
+    "gunicorn_workers": "Live worker processes reporting metrics.",
+    "worker_inflight_requests": "Requests currently being handled, per worker.",
+    "worker_uptime_seconds": "Seconds since the worker process started.",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    In-process counters/gauges/histograms for one worker.
+
+    Each worker periodically writes a JSON snapshot to METRICS_DIR; /metrics
+    merges the snapshots of all live workers so the three gunicorn workers
+    are reported as one service.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self.bounds: Dict[str, Tuple[float, ...]] = {}
+        self.collectors: List[Callable[["MetricsRegistry"], None]] = []
+        self.directory: Optional[str] = None
+        self.flush_interval = 5.0
+        self.started_at = time.time()
+        self._last_flush = 0.0
+        self._inflight = 0
+        self._lock = threading.Lock()
+
+    # ---- recording ----
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self.gauges.setdefault(name, {})[_key(labels)] = value
+
+    def observe(self, name: str, value: float, buckets=LATENCY_BUCKETS, **labels) -> None:
+        key = _key(labels)
+        with self._lock:
+            bounds = self.bounds.setdefault(name, tuple(buckets))
+            series = self.histograms.setdefault(name, {})
+            # [count per bucket..., +Inf count, sum]
+            data = series.get(key)
+            if data is None:
+                data = series[key] = [0.0] * (len(bounds) + 2)
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            else:
+                data[len(bounds)] += 1
+            data[-1] += value
+
+    def set_counter(self, name: str, value: float, **labels) -> None:
+        """Overwrite a counter with a running total kept elsewhere (collectors)."""
+        with self._lock:
+            self.counters.setdefault(name, {})[_key(labels)] = value
+
+    def set_histogram(self, name: str, bounds, counts, total: float, **labels) -> None:
+        """Overwrite a histogram from non-cumulative `counts` (len(bounds) + 1)."""
+        with self._lock:
+            self.bounds.setdefault(name, tuple(bounds))
+            self.histograms.setdefault(name, {})[_key(labels)] = [*counts, total]
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """Register a callable that copies external stats in at snapshot time."""
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    # ---- multi-process snapshots ----
+
+    def snapshot(self) -> dict:
+        for collector in self.collectors:
+            try:
+                collector(self)
+            except Exception:
+                pass
+        self.set_gauge("worker_inflight_requests", self._inflight, pid=os.getpid())
+        self.set_gauge(
+            "worker_uptime_seconds", round(time.time() - self.started_at, 1), pid=os.getpid()
+        )
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "counters": {n: [[list(k), v] for k, v in s.items()] for n, s in self.counters.items()},
+                "gauges": {n: [[list(k), v] for k, v in s.items()] for n, s in self.gauges.items()},
+                "histograms": {
+                    n: {"bounds": list(self.bounds[n]), "series": [[list(k), v] for k, v in s.items()]}
+                    for n, s in self.histograms.items()
+                },
+            }
+
+    def flush(self, force: bool = False) -> None:
+        if self.directory is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        path = os.path.join(self.directory, f"worker-{os.getpid()}.json")
+        # Unique per thread: under gthread two requests may flush at once
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _live_snapshots(self) -> List[dict]:
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if not (name.startswith("worker-") and name.endswith(".json")):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                pid = int(name[len("worker-") : -len(".json")])
+                os.kill(pid, 0)
+            except (ValueError, ProcessLookupError):
+                # Worker is gone (restart / max_requests); drop its file
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            except PermissionError:
+                pass
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        """Prometheus text exposition of all live workers, merged."""
+        self.flush(force=True)
+        snapshots = self._live_snapshots() if self.directory else [self.snapshot()]
+
+        counters: Dict[str, Dict[LabelKey, float]] = {}
+        gauges: Dict[str, Dict[LabelKey, float]] = {}
+        histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        bounds: Dict[str, List[float]] = {}
+        for snap in snapshots:
+            for name, series in snap["counters"].items():
+                target = counters.setdefault(name, {})
+                for labels, value in series:
+                    key = tuple(tuple(pair) for pair in labels)
+                    target[key] = target.get(key, 0) + value
+            for name, series in snap["gauges"].items():
+                target = gauges.setdefault(name, {})
+                for labels, value in series:
+                    # Gauges carry a pid label, so per-worker values stay separate
+                    target[tuple(tuple(pair) for pair in labels)] = value
+            for name, hist in snap["histograms"].items():
+                bounds.setdefault(name, hist["bounds"])
+                target = histograms.setdefault(name, {})
+                for labels, data in hist["series"]:
+                    key = tuple(tuple(pair) for pair in labels)
+                    current = target.get(key)
+                    target[key] = (
+                        list(data) if current is None else [a + b for a, b in zip(current, data)]
+                    )
+        gauges["gunicorn_workers"] = {(): len(snapshots)}
+
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> None:
+            if name in HELP:
+                lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def fmt(labels, extra=()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+        for name in sorted(counters):
+            header(name, "counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{name}{fmt(labels)} {value:g}")
+        for name in sorted(gauges):
+            header(name, "gauge")
+            for labels, value in sorted(gauges[name].items()):
+                lines.append(f"{name}{fmt(labels)} {value:g}")
+        for name in sorted(histograms):
+            header(name, "histogram")
+            name_bounds = bounds[name]
+            for labels, data in sorted(histograms[name].items()):
+                cumulative = 0.0
+                for bound, count in zip(name_bounds, data):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{fmt(labels, [('le', f'{bound:g}')])} {cumulative:g}")
+                cumulative += data[len(name_bounds)]
+                lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {cumulative:g}")
+                lines.append(f"{name}_sum{fmt(labels)} {data[-1]:.6f}")
+                lines.append(f"{name}_count{fmt(labels)} {cumulative:g}")
+        return "\n".join(lines) + "\n"
+
+    # ---- Flask / SQLAlchemy wiring ----
+
+    def init_app(self, app):
+        self.flush_interval = app.config.get("METRICS_FLUSH_SECONDS", 5.0)
+        directory = app.config.get("METRICS_DIR") or os.path.join(
+            tempfile.gettempdir(), "personal-site-metrics"
+        )
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        app.extensions["metrics"] = self
+
+        @app.before_request
+        def _metrics_start():
+            g._metrics_start = time.perf_counter()
+            g._db_queries = 0
+            g._db_time = 0.0
+            with self._lock:
+                self._inflight += 1
+
+        @app.teardown_request
+        def _metrics_inflight_done(exc=None):
+            if "_metrics_start" in g:
+                with self._lock:
+                    self._inflight -= 1
+
+        @app.after_request
+        def _metrics_observe(response):
+            start = g.get("_metrics_start")
+            if start is None:
+                return response
+            endpoint = request.endpoint or "unmatched"
+            self.inc(
+                "http_requests_total",
+                endpoint=endpoint,
+                method=request.method,
+                status=response.status_code,
+            )
+            self.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - start,
+                endpoint=endpoint,
+            )
+            self.observe(
+                "db_queries_per_request",
+                g.get("_db_queries", 0),
+                buckets=COUNT_BUCKETS,
+                endpoint=endpoint,
+            )
+            self.observe(
+                "db_time_per_request_seconds", g.get("_db_time", 0.0), endpoint=endpoint
+            )
+            self.flush()
+            return response
+
+
+metrics = MetricsRegistry()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own execution context, so a statement that
+    # fails (no after_cursor_execute) leaves nothing behind on the connection
+    if context is not None:
+        context._metrics_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    metrics.inc("db_queries_total")
+    metrics.observe("db_query_duration_seconds", elapsed)
+    if has_request_context() and "_db_queries" in g:
+        g._db_queries += 1
+        g._db_time += elapsed
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_, update
+
+from app.extensions import db
+from app.models import ContactMessage
+from app.services.email_service import send_contact_email
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+DEAD = "dead"
+SUPPRESSED = "suppressed"
+
+
+def _backoff_seconds(attempts: int, base: float, cap: float) -> float:
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(cap, base * (2 ** attempts)))
+
+
+def _claim(message_id: int, lease_seconds: float) -> bool:
+    """Atomically take a message so only one worker/process sends it."""
+    now = datetime.utcnow()
+    result = db.session.execute(
+        update(ContactMessage)
+        .where(
+            ContactMessage.id == message_id,
+            ContactMessage.delivery_status.in_((PENDING, SENDING)),
+            or_(
+                ContactMessage.next_attempt_at.is_(None),
+                ContactMessage.next_attempt_at <= now,
+            ),
+        )
+        .values(
+            delivery_status=SENDING,
+            next_attempt_at=now + timedelta(seconds=lease_seconds),
+        )
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def drain_outbox(app, batch_size: Optional[int] = None) -> int:
+    """
+    Send due outbox messages once. Must run inside an app context.
+
+    `sending` rows whose lease expired (a worker died mid-send) are retried.
+    Returns the number of messages processed.
+    """
+    cfg = app.config
+    batch_size = batch_size or cfg.get("EMAIL_OUTBOX_BATCH_SIZE", 20)
+    max_attempts = cfg.get("EMAIL_OUTBOX_MAX_ATTEMPTS", 6)
+    base = cfg.get("EMAIL_OUTBOX_BACKOFF_BASE", 5)
+    cap = cfg.get("EMAIL_OUTBOX_BACKOFF_MAX", 3600)
+    lease = cfg.get("EMAIL_OUTBOX_LEASE_SECONDS", 120)
+
+    now = datetime.utcnow()
+    due_ids = [
+        row.id
+        for row in db.session.query(ContactMessage.id)
+        .filter(
+            ContactMessage.delivery_status.in_((PENDING, SENDING)),
+            or_(
+                ContactMessage.next_attempt_at.is_(None),
+                ContactMessage.next_attempt_at <= now,
+            ),
+        )
+        .order_by(ContactMessage.id)
+        .limit(batch_size)
+    ]
+
+    processed = 0
+    for message_id in due_ids:
+        if not _claim(message_id, lease):
+            continue
+        cm = db.session.get(ContactMessage, message_id)
+        try:
+            send_contact_email(name=cm.name, email=cm.email, message=cm.message)
+        except Exception as e:
+            cm.delivery_attempts += 1
+            cm.last_error = str(e)[:500]
+            if cm.delivery_attempts >= max_attempts:
+                cm.delivery_status = DEAD
+                cm.next_attempt_at = None
+                app.logger.error(
+                    "[outbox] message %s dead-lettered after %s attempts: %s",
+                    cm.id,
+                    cm.delivery_attempts,
+                    e,
+                )
+            else:
+                delay = _backoff_seconds(cm.delivery_attempts, base, cap)
+                cm.delivery_status = PENDING
+                cm.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                app.logger.warning(
+                    "[outbox] message %s attempt %s failed, retry in %.1fs: %s",
+                    cm.id,
+                    cm.delivery_attempts,
+                    delay,
+                    e,
+                )
+        else:
+            cm.delivery_attempts += 1
+            cm.delivery_status = SENT
+            cm.sent_at = datetime.utcnow()
+            cm.next_attempt_at = None
+            cm.last_error = None
+            app.logger.info("[outbox] message %s sent", cm.id)
+        db.session.commit()
+        processed += 1
+    return processed
+
+
+class OutboxWorker:
+    """
+    Background thread draining the email outbox inside a gunicorn worker.
+
+    Each serving process calls `start()` once it is up (gunicorn's
+    post_worker_init, asgi.py), so rows left pending or backed off by a
+    previous deploy are retried without waiting for a new message; the
+    thread is per process (re-created after a fork). `notify()` wakes it
+    right after a new message is committed.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions["outbox_worker"] = self
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._wake = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, name="email-outbox", daemon=True
+            )
+            self._thread.start()
+
+    def start(self) -> None:
+        """Start draining in this process (EMAIL_OUTBOX_MODE=thread only)."""
+        self.notify()
+
+    def notify(self) -> None:
+        if self.app is None or self.app.config.get("EMAIL_OUTBOX_MODE") != "thread":
+            return
+        self._ensure_started()
+        self._wake.set()
+
+    def _run(self) -> None:
+        interval = self.app.config.get("EMAIL_OUTBOX_POLL_SECONDS", 30)
+        while True:
+            self._wake.wait(timeout=interval)
+            self._wake.clear()
+            with self.app.app_context():
+                try:
+                    drain_outbox(self.app)
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.exception("[outbox] drain failed: %s", e)
+                finally:
+                    db.session.remove()
+
+
+outbox_worker = OutboxWorker()
+
+
+def register_outbox_commands(app):
+    @app.cli.command("outbox-worker")
+    def outbox_worker_command():
+        """Drain the email outbox in a loop (use with EMAIL_OUTBOX_MODE=cli)."""
+        interval = app.config.get("EMAIL_OUTBOX_POLL_SECONDS", 30)
+        app.logger.info("[outbox] worker started (poll=%ss)", interval)
+        while True:
+            try:
+                processed = drain_outbox(app)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.exception("[outbox] drain failed: %s", e)
+                processed = 0
+            if not processed:
+                time.sleep(interval)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+
+# Expired counters are purged every this many increments (per process)
+PURGE_EVERY = 1000
+
+
+class SQLiteRateLimitStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Rate-limit counters shared by all workers on one host, in a single
+    SQLite file in WAL mode (the same approach as the shared response
+    cache). Registered with `limits` for `sqlite:///relative.db` and
+    `sqlite:////absolute/path.db` storage URIs.
+
+    Supports the fixed-window and sliding-window-counter strategies. Every
+    check is one short write transaction, so counts are exact across
+    processes; there is no server to run.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        self.path = uri[len("sqlite:///") :]
+        if not self.path:
+            raise ValueError("sqlite rate-limit storage needs a file path")
+        self.busy_timeout = float(options.get("busy_timeout", 5))
+        self._local = threading.local()
+        self._incr_count = 0
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit "
+            "(key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL) "
+            "WITHOUT ROWID"
+        )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conn(self) -> sqlite3.Connection:
+        # Connections are per thread and per process (never shared across a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            # Counters are disposable: losing the last writes on a power cut is fine
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _incr(self, conn, key: str, expires_at: float, amount: int, now: float) -> int:
+        # An expired counter restarts from `amount` with a fresh expiry
+        row = conn.execute(
+            "INSERT INTO rate_limit (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN rate_limit.expires_at <= ? THEN excluded.value "
+            "ELSE rate_limit.value + excluded.value END, "
+            "expires_at = CASE WHEN rate_limit.expires_at <= ? THEN excluded.expires_at "
+            "ELSE rate_limit.expires_at END "
+            "RETURNING value",
+            (key, amount, expires_at, now, now),
+        ).fetchone()
+        self._incr_count += 1
+        if self._incr_count % PURGE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limit WHERE expires_at <= ?", (now,))
+        return int(row[0])
+
+    def _get(self, conn, key: str, now: float) -> int:
+        row = conn.execute(
+            "SELECT value FROM rate_limit WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    # ---- fixed window ----
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        return self._incr(self._conn(), key, now + expiry, amount, now)
+
+    def get(self, key: str) -> int:
+        return self._get(self._conn(), key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = (
+            self._conn()
+            .execute(
+                "SELECT expires_at FROM rate_limit WHERE key = ? AND expires_at > ?",
+                (key, now),
+            )
+            .fetchone()
+        )
+        return float(row[0]) if row else now
+
+    def clear(self, key: str) -> None:
+        self._conn().execute("DELETE FROM rate_limit WHERE key = ?", (key,))
+
+    def reset(self) -> Optional[int]:
+        return self._conn().execute("DELETE FROM rate_limit").rowcount
+
+    def check(self) -> bool:
+        try:
+            self._conn().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    # ---- sliding window counter ----
+
+    @staticmethod
+    def _window_keys(key: str, expiry: int, now: float) -> Tuple[str, str, int]:
+        index = int(now // expiry)
+        return f"{key}/{index - 1}", f"{key}/{index}", index
+
+    def _sliding_window(self, conn, key: str, expiry: int, now: float):
+        previous_key, current_key, _ = self._window_keys(key, expiry, now)
+        previous_count = self._get(conn, previous_key, now)
+        current_count = self._get(conn, current_key, now)
+        elapsed = now % expiry
+        previous_ttl = float(expiry - elapsed) if previous_count else 0.0
+        current_ttl = 2 * expiry - elapsed
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        conn = self._conn()
+        now = time.time()
+        # IMMEDIATE takes the write lock up front, so the read-check-increment
+        # below is atomic across workers
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window(
+                conn, key, expiry, now
+            )
+            weighted = previous_count * previous_ttl / expiry + current_count
+            if int(weighted) + amount > limit:
+                conn.execute("COMMIT")
+                return False
+            _, current_key, index = self._window_keys(key, expiry, now)
+            # The current window is still weighed in during the next one
+            self._incr(conn, current_key, (index + 2) * expiry, amount, now)
+            conn.execute("COMMIT")
+            return True
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_sliding_window(self, key: str, expiry: int):
+        return self._sliding_window(self._conn(), key, expiry, time.time())
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key, _ = self._window_keys(key, expiry, time.time())
+        self._conn().execute(
+            "DELETE FROM rate_limit WHERE key IN (?, ?)", (previous_key, current_key)
+        )
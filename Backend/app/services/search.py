@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import text
+
+# Field weights: a hit in the title ranks above one buried in the description
+FIELD_WEIGHTS = {"title": 3.0, "short_description": 2.0, "description_md": 1.0}
+
+_token_re = re.compile(r"\w+", re.UNICODE)
+_niqqud_re = re.compile("[\u0591-\u05C7]")
+_hebrew_re = re.compile("[\u05D0-\u05EA]")
+
+# Single-letter Hebrew prefixes (ו, ה, ב, ל, מ, ש, כ) glued to the next word
+_HEBREW_PREFIXES = "והבלמשכ"
+_EN_SUFFIXES = ("ations", "ation", "ings", "ing", "edly", "ed", "ies", "es", "ly", "s")
+# "es" is a suffix only after these ("boxes", "caches"); elsewhere just "s" is ("services")
+_ES_AFTER = ("s", "x", "z", "ch", "sh")
+
+# InnoDB's default FULLTEXT stopwords (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD):
+# a required "+word*" on one of these can never match
+_FULLTEXT_STOPWORDS = frozenset(
+    "a about an are as at be by com de en for from how i in is it la of on or "
+    "that the this to was what when where who will with und www".split()
+)
+
+
+def _stem_en(token: str) -> str:
+    """
+    Light suffix stripping, applied the same way to documents and queries.
+    A trailing "e" is dropped from every stem, so "service"/"services" and
+    "cache"/"caching"/"cached" meet on one term.
+    """
+    stem = token
+    for suffix in _EN_SUFFIXES:
+        if not token.endswith(suffix) or len(token) - len(suffix) < 3:
+            continue
+        base = token[: -len(suffix)]
+        if suffix == "es" and not base.endswith(_ES_AFTER):
+            continue
+        stem = base + "y" if suffix == "ies" else base
+        break
+    if stem.endswith("e") and len(stem) > 3:
+        stem = stem[:-1]
+    return stem
+
+
+def _token_variants(token: str) -> List[str]:
+    if _hebrew_re.match(token):
+        if len(token) >= 4 and token[0] in _HEBREW_PREFIXES:
+            return [token, token[1:]]
+        return [token]
+    return [_stem_en(token)]
+
+
+def _tokens(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return _token_re.findall(_niqqud_re.sub("", value.lower()))
+
+
+def analyze(value: Optional[str]) -> List[str]:
+    """Tokenize, lowercase and stem English/Hebrew text into index terms."""
+    return [term for token in _tokens(value) for term in _token_variants(token)]
+
+
+class InvertedIndex:
+    """Term -> {doc_id: weight} postings with incremental per-document updates."""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.docs: Dict[int, Tuple[str, Iterable[str]]] = {}
+        self._sorted_terms: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def upsert(self, doc_id: int, signature: str, fields: Dict[str, str]) -> bool:
+        current = self.docs.get(doc_id)
+        if current is not None and current[0] == signature:
+            return False
+        self.remove(doc_id)
+
+        weights: Counter = Counter()
+        for name, value in fields.items():
+            field_weight = FIELD_WEIGHTS.get(name, 1.0)
+            for term in analyze(value):
+                weights[term] += field_weight
+
+        for term, weight in weights.items():
+            self.postings.setdefault(term, {})[doc_id] = weight
+        self.docs[doc_id] = (signature, tuple(weights))
+        self._sorted_terms = None
+        return True
+
+    def remove(self, doc_id: int) -> None:
+        current = self.docs.pop(doc_id, None)
+        if current is None:
+            return
+        for term in current[1]:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[term]
+        self._sorted_terms = None
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = self._sorted_terms
+        start = bisect.bisect_left(terms, prefix)
+        matches = []
+        for term in terms[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """
+        Every query term must match (AND); the last term also matches as a
+        prefix so type-ahead works. Results are ranked by weighted tf-idf.
+        """
+        tokens = _tokens(query)
+        if not tokens or not self.docs:
+            return []
+
+        total = len(self.docs)
+        scores: Optional[Dict[int, float]] = None
+        for i, token in enumerate(tokens):
+            # Variants of one token are alternatives (OR); tokens are combined with AND
+            candidates = set(_token_variants(token))
+            if i == len(tokens) - 1:
+                # Prefix on the raw last token too, since a partial word is not stemmed reliably
+                for prefix in candidates | {token}:
+                    candidates.update(self._expand_prefix(prefix))
+
+            term_scores: Dict[int, float] = {}
+            for candidate in candidates:
+                posting = self.postings.get(candidate)
+                if not posting:
+                    continue
+                idf = math.log(1 + total / len(posting))
+                for doc_id, weight in posting.items():
+                    term_scores[doc_id] = term_scores.get(doc_id, 0.0) + weight * idf
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    doc_id: score + term_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in term_scores
+                }
+            if not scores:
+                return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+
+def _signature(*values: Optional[str]) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for value in values:
+        digest.update((value or "").encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ProjectSearch:
+    """
+    Project search with three backends (SEARCH_BACKEND):
+
+    - "index":    in-process inverted index, refreshed incrementally when the
+                  projects version changes (project writes, not comments) or
+                  after SEARCH_INDEX_MAX_AGE (works on any database, incl. SQLite).
+                  Refreshes run on a background thread; requests keep using
+                  the current index meanwhile, and use the LIKE scan until
+                  the first build is done
+    - "fulltext": MySQL MATCH ... AGAINST on the FULLTEXT index; falls back to
+                  "index" on other dialects, and to LIKE when no word is
+                  indexable or nothing matches
+    - "like":     the original LIKE '%q%' scan
+    """
+
+    def __init__(self):
+        self.backend = "index"
+        self.max_age = 300
+        self.fulltext_min_token = 3
+        self.index = InvertedIndex()
+        self._version: Optional[int] = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def init_app(self, app):
+        self.backend = (app.config.get("SEARCH_BACKEND") or "index").lower()
+        self.max_age = app.config.get("SEARCH_INDEX_MAX_AGE", 300)
+        self.fulltext_min_token = app.config.get("SEARCH_FULLTEXT_MIN_TOKEN", 3)
+        app.extensions["project_search"] = self
+
+    def _active_backend(self, db) -> str:
+        if self.backend == "fulltext" and db.engine.dialect.name != "mysql":
+            return "index"
+        return self.backend
+
+    def _is_stale(self, version) -> bool:
+        return self._version != version or time.monotonic() - self._built_at > self.max_age
+
+    def refresh(self, db, version: int, force: bool = False) -> None:
+        """Bring the index up to date now (the background refresh runs this)."""
+        from app.models import Project
+
+        with self._lock:
+            if not force and not self._is_stale(version):
+                return
+        # Read outside the lock so searches keep running during the scan
+        rows = db.session.query(
+            Project.id,
+            Project.title,
+            Project.short_description,
+            Project.description_md,
+        ).all()
+        with self._lock:
+            seen = set()
+            for row in rows:
+                seen.add(row.id)
+                self.index.upsert(
+                    row.id,
+                    _signature(row.title, row.short_description, row.description_md),
+                    {
+                        "title": row.title,
+                        "short_description": row.short_description,
+                        "description_md": row.description_md,
+                    },
+                )
+            for doc_id in list(self.index.docs):
+                if doc_id not in seen:
+                    self.index.remove(doc_id)
+            self._version = version
+            self._built_at = time.monotonic()
+
+    def _refresh_in_background(self, db, version) -> None:
+        with self._lock:
+            if self._refreshing or not self._is_stale(version):
+                return
+            self._refreshing = True
+        app = current_app._get_current_object()
+
+        def run():
+            try:
+                with app.app_context():
+                    self.refresh(db, version)
+            except Exception as e:
+                app.logger.exception("[search] index refresh failed: %s", e)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="search-index-refresh", daemon=True).start()
+
+    def search_ids(self, db, q: str, version: int) -> Optional[List[int]]:
+        """Ranked project ids for `q`, or None when the LIKE scan should be used."""
+        backend = self._active_backend(db)
+        if backend == "fulltext":
+            return self._fulltext_ids(db, q)
+        if backend == "index":
+            self._refresh_in_background(db, version)
+            with self._lock:
+                if self._version is None:
+                    return None
+                return [doc_id for doc_id, _ in self.index.search(q)]
+        return None
+
+    def _fulltext_ids(self, db, q: str) -> Optional[List[int]]:
+        words = [
+            word
+            for word in _token_re.findall(q)
+            if len(word) >= self.fulltext_min_token and word.lower() not in _FULLTEXT_STOPWORDS
+        ]
+        if not words:
+            # Nothing MySQL could match: let the LIKE scan answer
+            return None
+        # Boolean mode: every word required, prefix match for type-ahead
+        boolean_query = " ".join(f"+{w}*" for w in words)
+        rows = db.session.execute(
+            text(
+                "SELECT id, MATCH (title, short_description, description_md) "
+                "AGAINST (:q IN BOOLEAN MODE) AS score FROM project "
+                "WHERE MATCH (title, short_description, description_md) "
+                "AGAINST (:q IN BOOLEAN MODE) ORDER BY score DESC, id DESC"
+            ),
+            {"q": boolean_query},
+        )
+        ids = [row.id for row in rows]
+        # No match may still be a LIKE match (e.g. a word inside a longer token)
+        return ids or None
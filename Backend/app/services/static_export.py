@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+import click
+from sqlalchemy import func
+
+from app.extensions import db, limiter
+from app.models import Comment, Project, ProjectImage
+from app.utils.compression import brotli
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _is_safe_slug(slug: str) -> bool:
+    """A slug usable as one directory name: no separators, NUL, "." or ".."."""
+    return bool(slug) and slug not in (".", "..") and not any(c in slug for c in "/\\\x00")
+
+
+def project_fingerprints() -> Dict[str, str]:
+    """
+    slug -> hash of everything the project's exported files depend on
+    (its columns, images and comment totals), from one aggregate query each.
+    """
+    comment_stats = dict(
+        (row[0], (row[1], row[2], str(row[3])))
+        for row in db.session.query(
+            Comment.project_id,
+            func.count(Comment.id),
+            func.max(Comment.id),
+            func.max(Comment.created_at),
+        ).group_by(Comment.project_id)
+    )
+    image_stats = dict(
+        (row[0], (row[1], row[2]))
+        for row in db.session.query(
+            ProjectImage.project_id, func.count(ProjectImage.id), func.max(ProjectImage.id)
+        ).group_by(ProjectImage.project_id)
+    )
+    columns = [c for c in Project.__table__.columns]
+    fingerprints = {}
+    for row in db.session.query(*columns):
+        values = dict(zip((c.name for c in columns), row))
+        state = [
+            values,
+            comment_stats.get(values["id"]),
+            image_stats.get(values["id"]),
+        ]
+        fingerprints[values["slug"]] = _digest(
+            json.dumps(state, sort_keys=True, default=str).encode("utf-8")
+        )
+    return fingerprints
+
+
+class StaticExporter:
+    """
+    Renders the read-only projects API into `out_dir` so a CDN can serve it:
+
+        api/projects/index.json                      GET /api/projects/
+        api/projects/<slug>/index.json               GET /api/projects/<slug>
+        api/projects/<slug>/html.json                ...?format=html
+        api/projects/<slug>/comments/page-<n>.json   comment pages, newest first
+
+    Every file also gets .gz (and .br with brotli installed) siblings.
+    manifest.json records sizes, sha256 and per-project fingerprints;
+    projects whose fingerprint didn't change are not re-rendered, and files
+    whose bytes didn't change are not rewritten (so a CDN sync uploads only
+    real changes).
+    """
+
+    def __init__(self, app, out_dir: str, comments_page_size: int = 100, html: bool = True):
+        self.app = app
+        self.out_dir = out_dir
+        self.root = os.path.realpath(out_dir)
+        self.comments_page_size = comments_page_size
+        self.html = html
+        self.client = app.test_client()
+        self.files: Dict[str, dict] = {}
+        self.written = 0
+
+    # ---- files ----
+
+    def _path(self, rel_path: str) -> str:
+        # Paths come from slugs in the DB and the previous manifest: never leave the root
+        path = os.path.realpath(os.path.join(self.root, rel_path))
+        if os.path.commonpath([self.root, path]) != self.root or path == self.root:
+            raise click.ClickException(f"Refusing to touch {rel_path!r} outside {self.out_dir}")
+        return path
+
+    def _write(self, rel_path: str, body: bytes) -> None:
+        path = self._path(rel_path)
+        digest = _digest(body)
+        self.files[rel_path] = {"sha256": digest, "bytes": len(body)}
+        previous = self.previous_files.get(rel_path)
+        if previous and previous["sha256"] == digest and os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        variants = {"": body, ".gz": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(body, quality=11)
+        for suffix, data in variants.items():
+            tmp_path = f"{path}{suffix}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path + suffix)
+        self.written += 1
+
+    def _remove(self, rel_path: str) -> None:
+        path = self._path(rel_path)
+        for suffix in ("", ".gz", ".br"):
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+
+    def _get(self, url: str, **params) -> bytes:
+        response = self.client.get(url, query_string=params)
+        if response.status_code != 200:
+            raise click.ClickException(f"GET {url} returned {response.status_code}")
+        return response.get_data()
+
+    # ---- export ----
+
+    def _export_project(self, slug: str) -> List[str]:
+        base = f"api/projects/{slug}"
+        url = f"/api/projects/{quote(slug, safe='')}"
+        paths = [f"{base}/index.json"]
+        self._write(paths[0], self._get(url))
+        if self.html:
+            paths.append(f"{base}/html.json")
+            self._write(paths[-1], self._get(url, format="html"))
+
+        cursor: Optional[str] = None
+        page = 1
+        while True:
+            params = {"limit": self.comments_page_size}
+            if cursor:
+                params["cursor"] = cursor
+            body = self._get(f"{url}/comments", **params)
+            paths.append(f"{base}/comments/page-{page}.json")
+            self._write(paths[-1], body)
+            next_cursor = json.loads(body)["meta"]["next_cursor"]
+            if not next_cursor:
+                return paths
+            if next_cursor == cursor:
+                raise click.ClickException(f"Comment pagination for {slug} is not advancing")
+            cursor = next_cursor
+            page += 1
+
+    def run(self, full: bool = False) -> dict:
+        start = time.perf_counter()
+        manifest_path = os.path.join(self.out_dir, MANIFEST_NAME)
+        previous = {}
+        if not full and os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                previous = json.load(f)
+        self.previous_files = previous.get("files", {})
+        previous_projects = previous.get("projects", {})
+
+        fingerprints = project_fingerprints()
+        projects = {}
+        rendered = 0
+        for slug, fingerprint in list(fingerprints.items()):
+            if not _is_safe_slug(slug):
+                click.echo(f"Skipping project with unsafe slug {slug!r}", err=True)
+                del fingerprints[slug]
+                continue
+            old = previous_projects.get(slug)
+            if old and old["fingerprint"] == fingerprint:
+                projects[slug] = old
+                for rel_path in old["files"]:
+                    self.files[rel_path] = self.previous_files[rel_path]
+                continue
+            files = self._export_project(slug)
+            rendered += 1
+            # Pages that no longer exist (e.g. fewer comments) are removed
+            for rel_path in (old or {}).get("files", []):
+                if rel_path not in files:
+                    self._remove(rel_path)
+            projects[slug] = {"fingerprint": fingerprint, "files": files}
+
+        for slug, old in previous_projects.items():
+            if slug not in fingerprints:
+                for rel_path in old["files"]:
+                    self._remove(rel_path)
+                if _is_safe_slug(slug):
+                    shutil.rmtree(self._path(f"api/projects/{slug}"), ignore_errors=True)
+
+        self._write("api/projects/index.json", self._get("/api/projects/"))
+
+        manifest = {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "encodings": ["gzip"] + (["br"] if brotli is not None else []),
+            "projects": projects,
+            "files": self.files,
+        }
+        os.makedirs(self.out_dir, exist_ok=True)
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(manifest_path + ".tmp", manifest_path)
+        return {
+            "projects": len(fingerprints),
+            "rendered": rendered,
+            "files_written": self.written,
+            "seconds": round(time.perf_counter() - start, 2),
+        }
+
+
+def register_export_commands(app):
+    @app.cli.command("export-static")
+    @click.option("--out", "out_dir", default="static-export", show_default=True)
+    @click.option("--full", is_flag=True, help="Ignore the previous manifest and re-render everything.")
+    @click.option("--comments-page-size", default=100, show_default=True)
+    @click.option("--html/--no-html", default=True, help="Also export ?format=html details.")
+    def export_static_command(out_dir, full, comments_page_size, html):
+        """Render the projects API into precompressed static JSON files."""
+        access_logger = logging.getLogger("app.access")
+        was_enabled, limiter.enabled = limiter.enabled, False
+        access_logger.disabled = True
+        try:
+            stats = StaticExporter(app, out_dir, comments_page_size, html).run(full=full)
+        finally:
+            limiter.enabled = was_enabled
+            access_logger.disabled = False
+        click.echo(
+            f"Exported {stats['projects']} projects to {out_dir} "
+            f"({stats['rendered']} re-rendered, {stats['files_written']} files written) "
+            f"in {stats['seconds']}s"
+        )
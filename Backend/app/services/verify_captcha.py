@@ -1,13 +1,113 @@
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
-import requests
+import hashlib
+import threading
+from typing import Optional, Dict, Any, Set
 from flask import current_app
 
+from app.services.cache import LRUCache
+from app.services.http_client import CircuitBreaker, http_client
+
 TURNSTILE_VERIFY_URL = "https://challenges.cloudflare.com/turnstile/v0/siteverify"
 HCAPTCHA_VERIFY_URL = "https://hcaptcha.com/siteverify"
 
 
+class CaptchaGuard:
+    """
+    Per-worker memory of verified tokens and provider outages.
+
+    Captcha tokens are single-use, so any token already answered by the
+    provider (success or failure) is rejected locally for the token's
+    validity window. After CAPTCHA_OUTAGE_THRESHOLD consecutive provider
+    errors, calls fail fast for CAPTCHA_OUTAGE_TTL seconds instead of
+    waiting on the network again. The outage state is the provider's
+    breaker in http_client (created with the captcha threshold/TTL), so one
+    breaker tracks each provider.
+    """
+
+    def __init__(self):
+        self.seen = LRUCache(max_entries=10_000, ttl=300)
+        self.outage_threshold = 3
+        self.outage_ttl = 30.0
+        self._providers: Set[str] = set()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "provider_success": 0,
+            "provider_failure": 0,
+            "provider_errors": 0,
+            "outage_fast_fail": 0,
+        }
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.seen.ttl = app.config.get("CAPTCHA_TOKEN_TTL", 300)
+        self.outage_threshold = app.config.get("CAPTCHA_OUTAGE_THRESHOLD", 3)
+        self.outage_ttl = app.config.get("CAPTCHA_OUTAGE_TTL", 30)
+        app.extensions["captcha_guard"] = self
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def seen_before(self, token: str) -> bool:
+        hit = self.seen.get(self.token_key(token)) is not None
+        self.incr("hits" if hit else "misses")
+        return hit
+
+    def record(self, token: str, success: bool) -> None:
+        self.seen.set(self.token_key(token), b"1" if success else b"0", 0)
+        self.incr("provider_success" if success else "provider_failure")
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            self._providers.add(provider)
+        return http_client.breaker(provider, self.outage_threshold, self.outage_ttl)
+
+    def in_outage(self, provider: str) -> bool:
+        # Half-open lets calls through again; the next result closes or reopens it
+        return self.breaker(provider).state == "open"
+
+    def mark_outage(self, provider: str) -> None:
+        """Count a provider error (http_client already fed it to the breaker)."""
+        self.incr("provider_errors")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            providers = list(self._providers)
+        counters["outages"] = sorted(p for p in providers if self.in_outage(p))
+        return counters
+
+    def collect_metrics(self, registry) -> None:
+        """Copy counters into a MetricsRegistry (see services/metrics.py)."""
+        with self._lock:
+            counters = dict(self._counters)
+        for event, value in counters.items():
+            registry.set_counter("captcha_events_total", value, event=event)
+
+
+captcha_guard = CaptchaGuard()
+
+
+def _outage_result(app, provider: str) -> bool:
+    # CAPTCHA_OUTAGE_MODE: "reject" (fail closed, default) or "allow" (fail open)
+    allow = (app.config.get("CAPTCHA_OUTAGE_MODE") or "reject").lower() == "allow"
+    app.logger.warning(
+        "CAPTCHA provider %s unavailable -> %s", provider, "allowing" if allow else "rejecting"
+    )
+    return allow
+
+
+def _is_json_response(resp) -> bool:
+    # An HTML error page (e.g. from a proxy in front of the provider) is an outage
+    return resp.headers.get("content-type", "").startswith("application/json")
+
+
 def verify_captcha(token: str, remote_ip: Optional[str] = None) -> bool:
 
     app = current_app
@@ -30,7 +130,7 @@ def verify_captcha(token: str, remote_ip: Optional[str] = None) -> bool:
         payload: Dict[str, Any] = {"secret": secret, "response": token}
         if remote_ip:
             payload["remoteip"] = remote_ip
-        verify_url = TURNSTILE_VERIFY_URL
+        verify_url = app.config.get("TURNSTILE_VERIFY_URL") or TURNSTILE_VERIFY_URL
 
     elif provider == "hcaptcha":
         secret = app.config.get("HCAPTCHA_SECRET")
@@ -40,25 +140,45 @@ def verify_captcha(token: str, remote_ip: Optional[str] = None) -> bool:
         payload = {"secret": secret, "response": token}
         if remote_ip:
             payload["remoteip"] = remote_ip
-        verify_url = HCAPTCHA_VERIFY_URL
+        verify_url = app.config.get("HCAPTCHA_VERIFY_URL") or HCAPTCHA_VERIFY_URL
 
     else:
         app.logger.error("Unknown CAPTCHA_PROVIDER: %s", provider)
         return False
 
+    if captcha_guard.seen_before(token):
+        app.logger.warning("CAPTCHA token replayed -> rejected without provider call.")
+        return False
+
+    if captcha_guard.in_outage(provider):
+        captcha_guard.incr("outage_fast_fail")
+        return _outage_result(app, provider)
+
     try:
-        resp = requests.post(verify_url, data=payload, timeout=6)
-        data = (
-            resp.json()
-            if resp.headers.get("content-type", "").startswith("application/json")
-            else {}
+        # No retries: the request is waiting, and the breaker handles outages
+        resp = http_client.post(
+            provider,
+            verify_url,
+            data=payload,
+            timeout=(
+                app.config.get("HTTP_CONNECT_TIMEOUT", 3.0),
+                app.config.get("CAPTCHA_READ_TIMEOUT", 6.0),
+            ),
+            retries=0,
+            validate=_is_json_response,
         )
-        success = bool(data.get("success"))
-        if not success:
-            app.logger.warning("CAPTCHA verification failed: %s", data)
-        else:
-            app.logger.debug("CAPTCHA verification success.")
-        return success
+        if resp.status_code >= 500 or not _is_json_response(resp):
+            raise RuntimeError(f"unexpected provider response ({resp.status_code})")
+        data = resp.json()
     except Exception as e:
         app.logger.exception("CAPTCHA verification error: %s", e)
-        return False
+        captcha_guard.mark_outage(provider)
+        return _outage_result(app, provider)
+
+    success = bool(data.get("success"))
+    captcha_guard.record(token, success)
+    if not success:
+        app.logger.warning("CAPTCHA verification failed: %s", data)
+    else:
+        app.logger.debug("CAPTCHA verification success.")
+    return success
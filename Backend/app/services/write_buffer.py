@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import inspect, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from werkzeug.exceptions import ServiceUnavailable
+
+from app.extensions import db
+from app.models.models import apply_comment_stats
+
+# WRITE_BUFFER_DURABILITY
+ACK_AFTER_FLUSH = "flush"
+ACK_AFTER_ENQUEUE = "enqueue"
+
+
+class WriteBufferFull(ServiceUnavailable):
+    """Raised when the buffer stays full for WRITE_BUFFER_ENQUEUE_TIMEOUT."""
+
+    description = "Too many pending writes. Please retry shortly."
+
+
+class WriteTimeout(ServiceUnavailable):
+    """
+    The row was not picked up for a flush within WRITE_BUFFER_ACK_TIMEOUT;
+    it was withdrawn from the queue, so retrying cannot duplicate it.
+    """
+
+    description = "The write could not be completed in time. Please retry."
+
+
+class _Pending:
+    __slots__ = ("obj", "done", "error", "taken", "cancelled")
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+        # Guarded by WriteBuffer._lock: the flusher takes a row, or save() withdraws it
+        self.taken = False
+        self.cancelled = False
+
+
+class WriteBuffer:
+    """
+    Optional group commit for single-row inserts (comments, contact messages).
+
+    Disabled (WRITE_BUFFER_ENABLED=false, the default), `save()` is a plain
+    add + commit. Enabled, each worker runs one flusher thread that waits
+    WRITE_BUFFER_MAX_DELAY_MS after the first queued row for more rows (up
+    to WRITE_BUFFER_MAX_BATCH) and commits them in one transaction, so a
+    burst pays one fsync instead of one per request.
+
+    WRITE_BUFFER_DURABILITY:
+    - "flush":   save() returns once the batch is committed; DB errors are
+                 raised in the request like before (ids are assigned).
+    - "enqueue": save() returns once the row is queued (no id yet); the
+                 rows are written with one multi-row INSERT, and are lost if
+                 the process dies before the flush.
+
+    When WRITE_BUFFER_MAX_PENDING rows are queued, save() waits up to
+    WRITE_BUFFER_ENQUEUE_TIMEOUT and then raises WriteBufferFull (503); a
+    "flush" row still queued after WRITE_BUFFER_ACK_TIMEOUT is withdrawn
+    and WriteTimeout (503) is raised.
+    Callbacks registered with `on_commit` run after every commit of their
+    model, in both modes.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.durability = ACK_AFTER_FLUSH
+        self.max_delay = 0.005
+        self.max_batch = 100
+        self.max_pending = 1000
+        self.enqueue_timeout = 0.5
+        self.ack_timeout = 10.0
+        self._callbacks: Dict[type, List[Callable[[list], None]]] = {}
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stats = {"rows": 0, "batches": 0, "failed_rows": 0, "rejected": 0}
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        self.app = app
+        self.enabled = cfg.get("WRITE_BUFFER_ENABLED", False)
+        self.durability = (cfg.get("WRITE_BUFFER_DURABILITY") or ACK_AFTER_FLUSH).lower()
+        if self.durability not in (ACK_AFTER_FLUSH, ACK_AFTER_ENQUEUE):
+            raise ValueError(f"Unknown WRITE_BUFFER_DURABILITY: {self.durability}")
+        self.max_delay = cfg.get("WRITE_BUFFER_MAX_DELAY_MS", 5) / 1000.0
+        self.max_batch = cfg.get("WRITE_BUFFER_MAX_BATCH", 100)
+        self.max_pending = cfg.get("WRITE_BUFFER_MAX_PENDING", 1000)
+        self.enqueue_timeout = cfg.get("WRITE_BUFFER_ENQUEUE_TIMEOUT", 0.5)
+        self.ack_timeout = cfg.get("WRITE_BUFFER_ACK_TIMEOUT", 10.0)
+        app.extensions["write_buffer"] = self
+
+    def on_commit(self, model: type, callback: Callable[[list], None]) -> None:
+        """Call `callback(objects)` after rows of `model` are committed."""
+        self._callbacks.setdefault(model, []).append(callback)
+
+    # ---- request side ----
+
+    def save(self, obj) -> bool:
+        """
+        Insert `obj`. Returns True once it is committed, False when it was
+        only queued (durability "enqueue", or a "flush" whose batch was
+        still being written at WRITE_BUFFER_ACK_TIMEOUT).
+        """
+        if not self.enabled:
+            db.session.add(obj)
+            db.session.commit()
+            self._run_callbacks([obj])
+            return True
+
+        pending = _Pending(obj)
+        self._ensure_started()
+        try:
+            self._queue.put(pending, timeout=self.enqueue_timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise WriteBufferFull(retry_after=1)
+
+        if self.durability == ACK_AFTER_ENQUEUE:
+            return False
+        if not pending.done.wait(self.ack_timeout):
+            with self._lock:
+                if not pending.taken:
+                    pending.cancelled = True
+            if pending.cancelled:
+                raise WriteTimeout(retry_after=1)
+            # Already being written: it will commit (or fail) on its own, so
+            # answer like enqueue mode rather than invite a duplicate retry
+            return False
+        if pending.error is not None:
+            raise pending.error
+        return True
+
+    # ---- flusher ----
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            # New process (or first use): rows queued before a fork stay with the parent
+            self._pid = os.getpid()
+            self._queue = queue.Queue(maxsize=self.max_pending)
+            self._thread = threading.Thread(target=self._run, name="write-buffer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _collect(self) -> List[_Pending]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            stop = None in batch
+            batch = [p for p in batch if p is not None]
+            if batch:
+                with self.app.app_context():
+                    self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: List[_Pending]) -> None:
+        with self._lock:
+            batch = [p for p in batch if not p.cancelled]
+            for pending in batch:
+                pending.taken = True
+        if not batch:
+            return
+        objects = [p.obj for p in batch]
+        try:
+            self._write(objects)
+        except SQLAlchemyError as e:
+            self.app.logger.warning("[write-buffer] batch of %s failed, retrying rows: %s", len(batch), e)
+            # Isolate the failing rows so one bad row doesn't fail the batch
+            committed = []
+            for pending in batch:
+                # A rolled-back flush may have left ids on the objects
+                pending.obj.id = None
+                try:
+                    self._write([pending.obj])
+                    committed.append(pending.obj)
+                except SQLAlchemyError as row_error:
+                    pending.error = row_error
+                    self.app.logger.error("[write-buffer] row dropped: %s", row_error)
+            objects = committed
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["rows"] += len(objects)
+            self._stats["failed_rows"] += len(batch) - len(objects)
+        try:
+            self._run_callbacks(objects)
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+    def _write(self, objects: list) -> None:
+        with Session(db.engine, expire_on_commit=False) as session:
+            if self.durability == ACK_AFTER_FLUSH:
+                # The ORM path assigns ids the request can return
+                session.add_all(objects)
+                session.flush()
+                _load_server_defaults(session, objects)
+            else:
+                for model, rows in _insert_groups(objects):
+                    session.execute(insert(model), rows)
+                # Core inserts skip the after_flush hook that keeps Project stats
+                apply_comment_stats(session, objects)
+            session.commit()
+
+    def _run_callbacks(self, objects: list) -> None:
+        by_model: Dict[type, list] = {}
+        for obj in objects:
+            by_model.setdefault(type(obj), []).append(obj)
+        for model, items in by_model.items():
+            for callback in self._callbacks.get(model, []):
+                try:
+                    callback(items)
+                except Exception as e:
+                    if self.app is not None:
+                        self.app.logger.exception("[write-buffer] on_commit callback failed: %s", e)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush what is queued and stop the flusher (runs at exit)."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None or self._pid != os.getpid():
+                return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def collect_metrics(self, registry) -> None:
+        """Copy counters into a MetricsRegistry (see services/metrics.py)."""
+        with self._lock:
+            stats = dict(self._stats)
+        registry.set_counter("write_buffer_rows_total", stats["rows"])
+        registry.set_counter("write_buffer_batches_total", stats["batches"])
+        registry.set_counter("write_buffer_failed_rows_total", stats["failed_rows"])
+        registry.set_counter("write_buffer_rejections_total", stats["rejected"])
+        registry.set_gauge(
+            "write_buffer_pending", self._queue.qsize() if self._queue is not None else 0
+        )
+
+
+def _load_server_defaults(session, objects: list) -> None:
+    """
+    Load server-generated columns (created_at = now() on the database
+    clock, as on the unbuffered path) with one SELECT per model instead of
+    a refresh per row.
+    """
+    by_model: Dict[type, list] = {}
+    for obj in objects:
+        by_model.setdefault(type(obj), []).append(obj)
+    for model, items in by_model.items():
+        unloaded = set().union(*(inspect(obj).unloaded for obj in items))
+        keys = [
+            c.key
+            for c in model.__table__.columns
+            if c.server_default is not None and c.key in unloaded
+        ]
+        if not keys:
+            continue
+        by_id = {obj.id: obj for obj in items}
+        rows = session.execute(
+            select(model.id, *(getattr(model, key) for key in keys)).where(
+                model.id.in_(list(by_id))
+            )
+        )
+        for row in rows:
+            for key in keys:
+                set_committed_value(by_id[row.id], key, getattr(row, key))
+
+
+def _insert_groups(objects: list):
+    # A multi-row INSERT needs the same keys in every row; unset columns
+    # are left out so their column defaults apply
+    groups: Dict[tuple, List[dict]] = {}
+    for obj in objects:
+        row = {
+            c.key: getattr(obj, c.key)
+            for c in obj.__table__.columns
+            if getattr(obj, c.key, None) is not None
+        }
+        groups.setdefault((type(obj), tuple(sorted(row))), []).append(row)
+    return [(model, rows) for (model, _), rows in groups.items()]
+
+
+write_buffer = WriteBuffer()
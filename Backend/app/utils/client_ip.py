@@ -0,0 +1,81 @@
+import ipaddress
+from functools import lru_cache
+from typing import Optional
+
+from flask import current_app, request
+
+_warned_untrusted_forwarding = False
+
+
+@lru_cache(maxsize=8)
+def _parse_networks(value: str):
+    networks = []
+    for item in value.split(","):
+        item = item.strip()
+        if item:
+            networks.append(ipaddress.ip_network(item, strict=False))
+    return tuple(networks)
+
+
+def _in_networks(addr: Optional[str], networks) -> bool:
+    if not addr or not networks:
+        return False
+    try:
+        ip = ipaddress.ip_address(addr)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip() -> Optional[str]:
+    """
+    Client IP, trusting forwarding headers only from configured proxies.
+
+    The socket peer plus X-Forwarded-For form a chain; walking it from the
+    right, the first TRUSTED_PROXY_HOPS addresses (the peer included) and any
+    address in TRUSTED_PROXIES are proxies, and the first other address is
+    the client. Values a client adds on the left are never reached.
+    CF-Connecting-IP is used only when the peer itself is a trusted proxy.
+    With the defaults (no proxies) this is the socket address.
+    """
+    cfg = current_app.config
+    hops = cfg.get("TRUSTED_PROXY_HOPS", 0)
+    networks = _parse_networks(cfg.get("TRUSTED_PROXIES", ""))
+    peer = request.remote_addr
+
+    if hops < 1 and not _in_networks(peer, networks):
+        if request.headers.get("X-Forwarded-For"):
+            _warn_untrusted_forwarding(peer)
+        return peer
+    cf_ip = (request.headers.get("CF-Connecting-IP") or "").strip()
+    if cf_ip:
+        return cf_ip
+
+    forwarded = [
+        addr.strip()
+        for addr in (request.headers.get("X-Forwarded-For") or "").split(",")
+        if addr.strip()
+    ]
+    chain = forwarded + [peer]
+    i = len(chain) - 1
+    while i > 0 and (len(chain) - 1 - i < hops or _in_networks(chain[i], networks)):
+        i -= 1
+    return chain[i]
+
+
+def _warn_untrusted_forwarding(peer: Optional[str]) -> None:
+    global _warned_untrusted_forwarding
+    if _warned_untrusted_forwarding:
+        return
+    _warned_untrusted_forwarding = True
+    current_app.logger.warning(
+        "[client-ip] X-Forwarded-For received from %s but no proxy is trusted; "
+        "every client behind that proxy shares one IP (set TRUSTED_PROXY_HOPS "
+        "or TRUSTED_PROXIES)",
+        peer,
+    )
+
+
+def rate_limit_key() -> str:
+    """flask_limiter key_func: one bucket per real client, not per proxy."""
+    return client_ip() or "127.0.0.1"
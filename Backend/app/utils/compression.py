@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import gzip
+from typing import Optional
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "text/css",
+    "text/html",
+    "text/plain",
+}
+
+
+def negotiate_encoding(accept_encoding: str, supported) -> Optional[str]:
+    """
+    Best encoding from an Accept-Encoding header, honoring q-values.
+    Ties go to the order of `supported` (brotli first).
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class Compressor:
+    """
+    gzip/brotli for JSON and text responses above COMPRESSION_MIN_SIZE.
+
+    Cached response bodies are compressed once per CacheEntry (see
+    `entry_body`); everything else is compressed in an after_request hook.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 5
+        self.supported = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        self.enabled = cfg.get("COMPRESSION_ENABLED", True)
+        self.min_size = cfg.get("COMPRESSION_MIN_SIZE", 1024)
+        self.gzip_level = cfg.get("COMPRESSION_GZIP_LEVEL", 6)
+        self.brotli_quality = cfg.get("COMPRESSION_BROTLI_QUALITY", 5)
+        app.extensions["compressor"] = self
+        if self.enabled:
+            app.after_request(self._compress_response)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0 keeps the output (and its ETag) identical across workers
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def choose(self, size: int) -> Optional[str]:
+        """Encoding for the current request, or None to send identity."""
+        if not self.enabled or size < self.min_size:
+            return None
+        return negotiate_encoding(request.headers.get("Accept-Encoding", ""), self.supported)
+
+    def entry_body(self, entry, encoding: str) -> bytes:
+        body = entry.encoded.get(encoding)
+        if body is None:
+            body = entry.encoded[encoding] = self.compress(entry.body, encoding)
+        return body
+
+    def _compress_response(self, response):
+        if response.mimetype in COMPRESSIBLE_MIMETYPES:
+            response.vary.add("Accept-Encoding")
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+        body = response.get_data()
+        encoding = self.choose(len(body))
+        if encoding is None:
+            return response
+        response.set_data(self.compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
+
+
+compressor = Compressor()
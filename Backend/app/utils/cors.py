@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from flask import current_app, request
+
+from app.utils.structured_logging import assign_request_id
+
+
+def parse_origins(raw) -> List[str]:
+    """CORS_ORIGINS as a list: comma-separated string or list, "*" for any."""
+    if raw is None:
+        return ["*"]
+    if isinstance(raw, str):
+        return ["*"] if raw.strip() == "*" else [o.strip() for o in raw.split(",") if o.strip()]
+    return [o.strip() for o in raw if o and o.strip()]
+
+
+class OriginMatcher:
+    """
+    Exact origins (case-insensitive set lookup) plus all `regex:` entries
+    compiled into one alternation that must match the whole origin.
+    """
+
+    def __init__(self, origins: Iterable[str]):
+        self.allow_any = False
+        self.exact = set()
+        patterns = []
+        for origin in origins:
+            if origin == "*":
+                self.allow_any = True
+            elif origin.lower().startswith("regex:"):
+                pattern = origin[len("regex:") :].strip()
+                try:
+                    re.compile(pattern)
+                except re.error:
+                    # Ignore invalid regex so the app still boots
+                    continue
+                patterns.append(f"(?:{pattern})")
+            else:
+                self.exact.add(origin.lower())
+        self.regex = re.compile("|".join(patterns), re.IGNORECASE) if patterns else None
+
+    def __call__(self, origin: str) -> bool:
+        if self.allow_any or origin.lower() in self.exact:
+            return True
+        return bool(self.regex is not None and self.regex.fullmatch(origin))
+
+
+class CorsEngine:
+    """
+    The single CORS implementation for /api/* and /health.
+
+    Origins come from CORS_ORIGINS (exact or `regex:` entries) plus
+    CORS_SITE_ORIGINS, are compiled once in init_app, and each distinct
+    Origin's decision is memoized (bounded by CORS_DECISION_CACHE_SIZE).
+    Preflights are answered from prebuilt headers right after the
+    request-id hook, before rate limiting, replica routing or any view runs.
+    """
+
+    def __init__(self):
+        self.paths = ("/api/", "/health")
+        self.allow_any = False
+        self.preflight_headers: dict = {}
+        self.allowed_origin = lambda origin: None
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        origins = parse_origins(cfg.get("CORS_ORIGINS", "*")) + parse_origins(
+            cfg.get("CORS_SITE_ORIGINS", [])
+        )
+        # In debug we can allow wildcard (*) to ease local testing
+        matcher = OriginMatcher(["*"] if cfg.get("DEBUG") else origins)
+        self.allow_any = matcher.allow_any
+
+        def allowed_origin(origin: str) -> Optional[str]:
+            """Access-Control-Allow-Origin value for `origin`, or None."""
+            if matcher.allow_any:
+                return "*"
+            return origin if matcher(origin) else None
+
+        self.allowed_origin = lru_cache(maxsize=cfg.get("CORS_DECISION_CACHE_SIZE", 1024))(
+            allowed_origin
+        )
+        self.preflight_headers = {
+            "Access-Control-Allow-Methods": ", ".join(cfg.get("CORS_METHODS", ["GET", "POST"])),
+            "Access-Control-Allow-Headers": ", ".join(
+                cfg.get("CORS_ALLOW_HEADERS", ["Content-Type"])
+            ),
+            "Access-Control-Max-Age": str(cfg.get("CORS_MAX_AGE", 86400)),
+        }
+        app.extensions["cors"] = self
+        # Right after the request-id hook (so preflights carry X-Request-ID),
+        # ahead of the limiter and other hooks
+        hooks = app.before_request_funcs.setdefault(None, [])
+        position = hooks.index(assign_request_id) + 1 if assign_request_id in hooks else 0
+        hooks.insert(position, self._preflight)
+        app.after_request(self._add_headers)
+
+    def _origin_for(self) -> Optional[str]:
+        origin = request.headers.get("Origin")
+        if not origin or not request.path.startswith(self.paths):
+            return None
+        return self.allowed_origin(origin)
+
+    def _preflight(self):
+        if request.method != "OPTIONS" or "Access-Control-Request-Method" not in request.headers:
+            return None
+        allow_origin = self._origin_for()
+        if allow_origin is None:
+            # Not allowed: the default OPTIONS response carries no CORS headers
+            return None
+        response = current_app.response_class(status=204)
+        response.headers.extend(self.preflight_headers)
+        response.headers["Access-Control-Allow-Origin"] = allow_origin
+        return response
+
+    def _add_headers(self, response):
+        if not request.path.startswith(self.paths):
+            return response
+        if not self.allow_any:
+            # Shared caches must not hand one origin's response to another
+            response.vary.add("Origin")
+        if "Access-Control-Allow-Origin" not in response.headers:
+            allow_origin = self._origin_for()
+            if allow_origin is not None:
+                response.headers["Access-Control-Allow-Origin"] = allow_origin
+        return response
@@ -0,0 +1,60 @@
+from flask import request
+
+from app.services.cache import CacheEntry, content_etag
+from app.utils.compression import compressor
+from app.utils.responses import raw_json_response
+
+
+def _encoded_response(body: bytes, etag: str, status: int, entry=None):
+    # Compress before make_conditional so If-None-Match is compared against
+    # the ETag of the representation this client actually receives
+    encoding = compressor.choose(len(body))
+    if encoding is None:
+        response = raw_json_response(body, status=status)
+        response.set_etag(etag)
+        return response
+    data = (
+        compressor.entry_body(entry, encoding)
+        if entry is not None
+        else compressor.compress(body, encoding)
+    )
+    response = raw_json_response(data, status=status)
+    response.headers["Content-Encoding"] = encoding
+    response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def conditional_json_response(entry: CacheEntry, status: int = 200):
+    """
+    Serve a cached JSON body with a strong ETag and, when the entry knows
+    it, a Last-Modified taken from the data (never the cache fill time).
+
+    Returns 304 with no body when If-None-Match / If-Modified-Since match.
+    Compressed variants are computed once per cache entry.
+    """
+    response = _encoded_response(entry.body, entry.etag, status, entry=entry)
+    if entry.last_modified is not None:
+        response.last_modified = entry.last_modified
+    return response.make_conditional(request)
+
+
+def conditional_body_response(body: bytes, status: int = 200):
+    """Same as conditional_json_response for bodies that are not cached."""
+    response = _encoded_response(body, content_etag(body), status)
+    return response.make_conditional(request)
+
+
+def register_http_cache(app):
+    """Apply the Cache-Control policy configured per blueprint to GET responses."""
+    policies = app.config.get("HTTP_CACHE_CONTROL") or {}
+
+    @app.after_request
+    def apply_cache_control(response):
+        if request.method not in ("GET", "HEAD"):
+            return response
+        if response.status_code not in (200, 304):
+            return response
+        policy = policies.get(request.blueprint)
+        if policy and "Cache-Control" not in response.headers:
+            response.headers["Cache-Control"] = policy
+        return response
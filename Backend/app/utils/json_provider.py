@@ -0,0 +1,60 @@
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to Flask's stdlib provider
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask's default provider with orjson doing the encoding.
+
+    Keys stay sorted and unsupported types still go through Flask's
+    `default` (RFC 822 datetimes, UUIDs, dataclasses), so the decoded JSON
+    is the same; non-ASCII text is emitted as UTF-8 instead of \\u escapes.
+    """
+
+    def _option(self, indent: bool = False) -> int:
+        option = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_NON_STR_KEYS
+        )
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._option(indent))
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits: let the stdlib handle it
+            return super().dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self.dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
+
+
+def configure_json(app) -> None:
+    """Use orjson for jsonify/json_response/json_body when it is installed."""
+    if app.config.get("JSON_FAST_ENCODER", True) and orjson is not None:
+        app.json = OrjsonProvider(app)
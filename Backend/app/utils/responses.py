@@ -1,7 +1,25 @@
 from typing import Any, Optional
-from flask import jsonify
+from flask import jsonify, current_app
 
 
 def json_response(data: Any = None, error: Optional[dict] = None, status: int = 200):
     payload = {"data": data, "error": error}
     return jsonify(payload), status
+
+
+def json_body(
+    data: Any = None, error: Optional[dict] = None, meta: Optional[dict] = None
+) -> bytes:
+    """Serialize the standard {data, error} envelope to bytes (for caching)."""
+    payload = {"data": data, "error": error}
+    if meta is not None:
+        payload["meta"] = meta
+    dumps_bytes = getattr(current_app.json, "dumps_bytes", None)
+    if dumps_bytes is not None:
+        return dumps_bytes(payload) + b"\n"
+    return (current_app.json.dumps(payload) + "\n").encode("utf-8")
+
+
+def raw_json_response(body: bytes, status: int = 200):
+    """Build a response from an already-serialized JSON envelope."""
+    return current_app.response_class(body, status=status, mimetype="application/json")
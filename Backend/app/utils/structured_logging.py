@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+# Incoming X-Request-ID values are echoed back, so only accept safe tokens
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "request_id",
+}
+
+_listener: Optional[QueueListener] = None
+_queue: Optional[queue.Queue] = None
+_pid: Optional[int] = None
+_queue_handlers: list = []
+
+
+def current_request_id() -> str:
+    if has_request_context():
+        return g.get("request_id", "-")
+    return "-"
+
+
+def assign_request_id() -> None:
+    """before_request hook: set g.request_id (echoed as X-Request-ID)."""
+    incoming = request.headers.get("X-Request-ID", "")
+    g.request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+    g._log_start = time.perf_counter()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra={...}` fields are included as-is."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "pid": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamps the request id onto each record. Runs on the QueueHandler, i.e.
+    in the request thread, since the listener thread has no request context.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = current_request_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps `rate` of INFO-and-below records from the given loggers; warnings
+    and errors always pass. Sampling is keyed on the request id so a
+    request's lines are kept or dropped together.
+    """
+
+    def __init__(self, rate: float, loggers=("app.access",)):
+        super().__init__()
+        self.rate = rate
+        self.loggers = tuple(loggers)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1 or record.levelno >= logging.WARNING:
+            return True
+        if not record.name.startswith(self.loggers):
+            return True
+        key = getattr(record, "request_id", "-")
+        if key == "-":
+            key = str(record.created)
+        return (zlib.crc32(key.encode("utf-8")) % 10_000) < self.rate * 10_000
+
+
+class _PreparedQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve args/tracebacks now (they may not be picklable or may
+        # change later) but keep the record structured for the formatter.
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_handlers(app) -> list:
+    cfg = app.config
+    level = cfg.get("LOG_LEVEL", "INFO")
+    if cfg.get("LOG_FORMAT", "json") == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s [%(levelname)s] %(name)s [%(request_id)s] - %(message)s",
+            "%Y-%m-%d %H:%M:%S",
+        )
+
+    handlers = []
+    log_file = cfg.get("LOG_FILE", "app.log")
+    if log_file:
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=1_000_000, backupCount=5, encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        file_handler.setLevel(level)
+        handlers.append(file_handler)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    console_handler.setLevel(level)
+    handlers.append(console_handler)
+    return handlers
+
+
+def _start_listener(handlers) -> None:
+    global _listener, _queue, _pid
+    _queue = queue.Queue(-1)
+    _listener = QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _pid = os.getpid()
+    for handler in _queue_handlers:
+        handler.queue = _queue
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None and _pid == os.getpid():
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+
+
+def _restart_after_fork() -> None:
+    # The listener thread does not survive fork (gunicorn --preload); give
+    # the child its own queue and thread with the same handlers.
+    if _listener is not None:
+        _start_listener(_listener.handlers)
+
+
+def configure_logging(app) -> None:
+    """
+    Route app logs through a queue so request threads never block on file
+    writes or rotation; a single QueueListener thread per process does the I/O.
+
+    Safe to call repeatedly (tests, CLI, gunicorn workers): the previous
+    queue handler is replaced rather than duplicated, and forked children
+    start their own listener.
+    """
+    first_call = _pid is None
+    _stop_listener()
+    # app.logger is the shared "app" logger, so this also covers earlier apps;
+    # Flask's own synchronous stderr handler is replaced by the listener's
+    app.logger.removeHandler(default_handler)
+    for handler in list(app.logger.handlers):
+        if getattr(handler, "_structured", False):
+            app.logger.removeHandler(handler)
+    _queue_handlers.clear()
+
+    _start_listener(_build_handlers(app))
+    if first_call:
+        atexit.register(_stop_listener)
+        os.register_at_fork(after_in_child=_restart_after_fork)
+
+    queue_handler = _PreparedQueueHandler(_queue)
+    queue_handler._structured = True
+    _queue_handlers.append(queue_handler)
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(SamplingFilter(app.config.get("LOG_SAMPLE_RATE", 1.0)))
+    app.logger.addHandler(queue_handler)
+    app.logger.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+
+    access_logger = logging.getLogger("app.access")
+    log_access = app.config.get("LOG_ACCESS", True)
+
+    app.before_request(assign_request_id)
+
+    @app.after_request
+    def _log_request(response):
+        request_id = g.get("request_id")
+        if request_id:
+            response.headers["X-Request-ID"] = request_id
+        if log_access:
+            start = g.get("_log_start")
+            access_logger.info(
+                "%s %s %s",
+                request.method,
+                request.path,
+                response.status_code,
+                extra={
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2)
+                    if start
+                    else None,
+                },
+            )
+        return response
@@ -0,0 +1,61 @@
+"""
+Plain-text sanitization for user input (comments, contact messages).
+
+Output is identical to `bleach.clean(value, tags=[], strip=True)` (optionally
+followed by whitespace collapsing), but text without markup skips the
+html5lib parse: control characters are mapped the way html5lib does it and
+`>` is escaped in one str.translate. Anything containing `<` or `&` (tags,
+comments, entities) or a form feed still goes through bleach, with a
+Cleaner reused per thread instead of the one bleach.clean builds per call.
+See benchmarks/sanitizer_bench.py for the differential corpus.
+"""
+import re
+import threading
+
+from bleach.sanitizer import Cleaner
+
+# html5lib drops NUL, reports other C0 controls (except tab/LF/CR) as "?"
+# and turns CR / CRLF into LF. Form feed depends on its position, so text
+# containing one takes the bleach path.
+_CONTROL_MAP = {0: None}
+_CONTROL_MAP.update({c: "?" for c in range(1, 32) if chr(c) not in "\t\n\r\x0c"})
+_CONTROL_MAP[ord(">")] = "&gt;"
+
+_CLEAN_TABLE = {**_CONTROL_MAP, ord("\r"): "\n"}
+# When whitespace is collapsed anyway, CR is just whitespace
+_SANITIZE_TABLE = {**_CONTROL_MAP, ord("\r"): " "}
+# str.translate is slow on non-ASCII text; most input has nothing to map
+_MAPPED_RE = re.compile("[\x00-\x08\x0b\x0d-\x1f>]")
+
+
+def _needs_bleach(value: str) -> bool:
+    return "<" in value or "&" in value or "\x0c" in value
+
+
+# Cleaner keeps parser state between calls and is not thread-safe
+_local = threading.local()
+
+
+def _bleach_strip(value: str) -> str:
+    cleaner = getattr(_local, "cleaner", None)
+    if cleaner is None:
+        cleaner = _local.cleaner = Cleaner(tags=[], attributes={}, protocols=[], strip=True)
+    return cleaner.clean(value)
+
+
+def clean_text(value: str) -> str:
+    """Strip all markup, keeping whitespace as is (same as bleach.clean)."""
+    if _needs_bleach(value):
+        return _bleach_strip(value)
+    if not _MAPPED_RE.search(value):
+        return value
+    return value.replace("\r\n", "\n").translate(_CLEAN_TABLE)
+
+
+def sanitize_text(value: str) -> str:
+    """Strip all markup and collapse whitespace runs to single spaces."""
+    if _needs_bleach(value):
+        return " ".join(_bleach_strip(value).split())
+    if _MAPPED_RE.search(value):
+        value = value.translate(_SANITIZE_TABLE)
+    return " ".join(value.split())
@@ -0,0 +1,20 @@
+# asgi.py
+# ASGI entry point for hosts that only speak ASGI:
+#   pip install -r requirements-async.txt
+#   uvicorn asgi:app --workers 3 --port 8000
+#
+# This is a compatibility shim, not an async I/O path: WsgiToAsgi runs each
+# request of the sync Flask app on a thread pool, so a slow captcha/Brevo/
+# MySQL call still holds a thread, as with gunicorn's gthread workers. For
+# cooperative I/O use GUNICORN_WORKER_CLASS=gevent (see gunicorn.conf.py).
+from asgiref.wsgi import WsgiToAsgi
+from dotenv import load_dotenv
+import os
+
+load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
+
+from app import create_app
+from app.services.outbox import outbox_worker
+
+app = WsgiToAsgi(create_app())
+outbox_worker.start()
@@ -0,0 +1,63 @@
+# benchmarks/compare.py
+"""
+Compare two reports from benchmarks/run.py and flag regressions.
+
+Usage: python benchmarks/compare.py before.json after.json [--threshold 10]
+Exits 1 when any scenario's p95 or RPS regressed by more than the threshold (%).
+"""
+import argparse
+import json
+import sys
+
+METRICS = [
+    # (key, higher_is_better)
+    ("rps", True),
+    ("p50_ms", False),
+    ("p95_ms", False),
+    ("p99_ms", False),
+    ("alloc_peak_kib_mean", False),
+]
+GATED = ("rps", "p95_ms")
+
+
+def pct_change(before, after):
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"before: {before['meta'].get('commit')}  after: {after['meta'].get('commit')}")
+    regressed = False
+    for name, new in after["scenarios"].items():
+        old = before["scenarios"].get(name)
+        if old is None:
+            print(f"{name}: new scenario")
+            continue
+        parts = []
+        for key, higher_is_better in METRICS:
+            change = pct_change(old.get(key, 0), new.get(key, 0))
+            worse = -change if higher_is_better else change
+            flag = ""
+            if key in GATED and worse > args.threshold:
+                flag = " !"
+                regressed = True
+            parts.append(f"{key} {old.get(key)} -> {new.get(key)} ({change:+.1f}%){flag}")
+        print(f"{name}:\n  " + "\n  ".join(parts))
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/cors_bench.py
+"""
+Preflight latency with and without the CORS fast path, plus the cost of
+origin matching.
+
+1. OPTIONS /api/projects/<slug>/comments from the Vercel origin, answered by
+   the before_request fast path vs. the full request pipeline (rate limiter,
+   replica routing, metrics, automatic OPTIONS view, after_request hooks).
+2. Origin decision: per-request scan of the origin list (what the old
+   setup did) vs. the compiled matcher vs. the memoized decision.
+
+Usage (from Backend/):
+    python benchmarks/cors_bench.py --repeat 5000
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+ORIGIN = "https://personal-site-alpha-rosy.vercel.app"
+PREFLIGHT_HEADERS = {
+    "Origin": ORIGIN,
+    "Access-Control-Request-Method": "POST",
+    "Access-Control-Request-Headers": "content-type",
+}
+
+
+def timed(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), statistics.quantiles(samples, n=100)[98]
+
+
+def report(label, result, baseline=None):
+    p50, p99 = result
+    extra = f"  ({baseline[0] / p50:.1f}x)" if baseline else ""
+    print(f"  {label:<28} p50={p50:.4f}ms p99={p99:.4f}ms{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="cors-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'app.db')}")
+    os.environ.setdefault("RATELIMIT_STORAGE_URI", f"sqlite:///{os.path.join(workdir, 'rl.db')}")
+    os.environ.setdefault("RATELIMIT_DEFAULT", "1000000 per hour")
+    os.environ.setdefault("LOG_FILE", "")
+    os.environ.setdefault("LOG_ACCESS", "false")
+    os.environ["FLASK_DEBUG"] = "0"
+
+    from app import create_app
+    from app.extensions import cors, db
+    from app.models import Project
+    from app.utils.cors import OriginMatcher, parse_origins
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(Project(slug="bench", title="Bench"))
+        db.session.commit()
+    client = app.test_client()
+    url = "/api/projects/bench/comments"
+
+    def preflight():
+        response = client.options(url, headers=PREFLIGHT_HEADERS)
+        assert response.headers.get("Access-Control-Allow-Origin") == ORIGIN
+
+    print(f"preflight OPTIONS {url} ({args.repeat} requests)")
+    hooks = app.before_request_funcs[None]
+    hooks.remove(cors._preflight)
+    slow = timed(preflight, args.repeat)
+    report("full pipeline", slow)
+    hooks.insert(0, cors._preflight)
+    report("fast path", timed(preflight, args.repeat), slow)
+
+    origins = parse_origins(app.config["CORS_ORIGINS"]) + parse_origins(
+        app.config["CORS_SITE_ORIGINS"]
+    ) + [r"regex:https://personal-site-[\w-]+\.vercel\.app"]
+
+    def scan():
+        # One try per configured entry, like a per-request list walk
+        for o in origins:
+            if o.startswith("regex:"):
+                if re.match(o[len("regex:") :], ORIGIN, flags=re.IGNORECASE):
+                    return True
+            elif o.lower() == ORIGIN.lower():
+                return True
+        return False
+
+    matcher = OriginMatcher(origins)
+    print(f"origin decision ({len(origins)} configured entries)")
+    baseline = timed(scan, args.repeat)
+    report("list scan", baseline)
+    report("compiled matcher", timed(lambda: matcher(ORIGIN), args.repeat), baseline)
+    report("memoized decision", timed(lambda: cors.allowed_origin(ORIGIN), args.repeat), baseline)
+
+
+if __name__ == "__main__":
+    main()
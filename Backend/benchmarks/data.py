@@ -0,0 +1,79 @@
+# benchmarks/data.py
+"""Synthetic catalog generator built from the real projects in scripts/seed.py."""
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from scripts.seed import PROJECTS  # noqa: E402
+
+COMMENT_SNIPPETS = [
+    "Awesome work!",
+    "Really clean UI, how did you handle caching?",
+    "Great project, the realtime updates are smooth.",
+    "Would love to see a write-up about the architecture.",
+    "עבודה מעולה, אהבתי את העיצוב",
+]
+
+
+def generate_projects(n: int, seed: int = 1):
+    """`n` project rows cycling through the seed catalog with unique slugs."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        base = PROJECTS[i % len(PROJECTS)]
+        row = dict(base)
+        row["slug"] = f"{base['slug']}-{i}"
+        row["title"] = f"{base['title']} {i}"
+        # Vary description length so payload sizes are realistic
+        row["description_md"] = base["description_md"] + "\n\n" + " ".join(
+            rng.choice(COMMENT_SNIPPETS) for _ in range(rng.randint(0, 40))
+        )
+        rows.append(row)
+    return rows
+
+
+def generate_comments(project_ids, m: int, seed: int = 1):
+    """`m` comment rows spread over `project_ids` (skewed towards the first ones)."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for i in range(m):
+        project_id = project_ids[min(int(rng.expovariate(0.3)), len(project_ids) - 1)]
+        rows.append(
+            {
+                "project_id": project_id,
+                "name": f"Visitor {i}",
+                "email": f"visitor{i}@example.com",
+                "content": rng.choice(COMMENT_SNIPPETS),
+                "created_at": start + timedelta(seconds=i * 37),
+            }
+        )
+    return rows
+
+
+def seed_database(db, n_projects: int, m_comments: int, seed: int = 1):
+    from app.models import Project, ProjectImage, Comment
+    from app.models.models import image_urls_from_json
+
+    projects = generate_projects(n_projects, seed)
+    db.session.bulk_insert_mappings(Project, projects)
+    db.session.commit()
+    ids = [row.id for row in db.session.query(Project.id).order_by(Project.id)]
+    # Bulk inserts skip the flush hook that normalizes images_json
+    db.session.bulk_insert_mappings(
+        ProjectImage,
+        [
+            {"project_id": project_id, "position": position, "url": url}
+            for project_id, row in zip(ids, projects)
+            for position, url in enumerate(image_urls_from_json(row.get("images_json")) or [])
+        ],
+    )
+    db.session.commit()
+    db.session.bulk_insert_mappings(Comment, generate_comments(ids, m_comments, seed))
+    db.session.commit()
+    return ids
@@ -0,0 +1,51 @@
+# benchmarks/markdown_check.py
+"""
+Check of the description renderer: excerpts and TOC entries must keep words
+apart across soft/hard line breaks and inline markup. Exits non-zero on a
+mismatch.
+
+Usage (from Backend/):
+    python benchmarks/markdown_check.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.markdown_render import render_markdown  # noqa: E402
+
+# (markdown, expected excerpt, expected TOC texts)
+CASES = [
+    (
+        "This project uses\nReact and Flask.\nIt has a [link](https://example.com) too.",
+        "This project uses React and Flask. It has a link too.",
+        [],
+    ),
+    (
+        "# Setup\n\nRun `make`  \nthen open\nthe *browser*.\n\n## Deploy\n\nDone.",
+        "Run make then open the browser. Done.",
+        ["Setup", "Deploy"],
+    ),
+    (
+        "# ניהול משימות\n\nשורה ראשונה\nשורה שנייה",
+        "שורה ראשונה שורה שנייה",
+        ["ניהול משימות"],
+    ),
+]
+
+
+def main():
+    failures = 0
+    for source, excerpt, toc in CASES:
+        rendered = render_markdown(source)
+        got_toc = [entry["text"] for entry in rendered.toc]
+        if rendered.excerpt != excerpt or got_toc != toc:
+            failures += 1
+            print(f"MISMATCH for {source!r}:\n  excerpt {rendered.excerpt!r}\n  toc {got_toc!r}")
+    print(f"markdown check: {len(CASES)} cases, {failures} mismatches")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
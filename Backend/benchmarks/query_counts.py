@@ -0,0 +1,86 @@
+# benchmarks/query_counts.py
+"""
+Count SQL statements issued per projects endpoint (response cache disabled)
+and fail if any endpoint exceeds its budget.
+
+Usage (from Backend/):
+    python benchmarks/query_counts.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Statement budget per request; the detail call warms the slug -> id map
+BUDGETS = {
+    "GET /api/projects/": 1,
+    "GET /api/projects/<slug>": 1,
+    "GET /api/projects/<slug>/comments": 1,
+    # INSERT + the Project.comment_count / last_comment_at UPDATE (same
+    # transaction, see models.apply_comment_stats) + reloading the committed row
+    # for the response
+    "POST /api/projects/<slug>/comments": 3,
+}
+
+
+def main():
+    db_path = os.path.join(tempfile.mkdtemp(), "query_counts.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    os.environ["CAPTCHA_BYPASS"] = "true"
+
+    from sqlalchemy import event
+    from app import create_app
+    from app.extensions import db
+    from app.models import Project, Comment
+
+    app = create_app()
+    app.config["RATELIMIT_ENABLED"] = False
+    with app.app_context():
+        db.create_all()
+        project = Project(slug="demo", title="Demo", images_json="[]")
+        db.session.add(project)
+        db.session.flush()
+        db.session.add_all(
+            Comment(project_id=project.id, name="n", email="n@example.com", content=f"c{i}")
+            for i in range(50)
+        )
+        db.session.commit()
+
+        statements = []
+        event.listen(
+            db.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+    client = app.test_client()
+    calls = [
+        ("GET /api/projects/", lambda: client.get("/api/projects/")),
+        ("GET /api/projects/<slug>", lambda: client.get("/api/projects/demo")),
+        ("GET /api/projects/<slug>/comments", lambda: client.get("/api/projects/demo/comments")),
+        (
+            "POST /api/projects/<slug>/comments",
+            lambda: client.post(
+                "/api/projects/demo/comments",
+                json={"name": "Bob", "email": "bob@example.com", "content": "hi", "captcha_token": "x"},
+            ),
+        ),
+    ]
+
+    failed = False
+    for name, call in calls:
+        statements.clear()
+        response = call()
+        count = len(statements)
+        budget = BUDGETS[name]
+        status = "ok" if count <= budget else "OVER BUDGET"
+        failed = failed or count > budget
+        print(f"{name:<36} status={response.status_code} statements={count} budget={budget} {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
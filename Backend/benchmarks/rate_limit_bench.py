@@ -0,0 +1,119 @@
+# benchmarks/rate_limit_bench.py
+"""
+Cost of a rate-limit check per request, per storage backend.
+
+1. Storage only: `limits` hit() latency for memory:// (per worker, the old
+   default) and the shared SQLite file, with one and with several processes
+   hitting the same file concurrently (like gunicorn workers).
+2. End to end: GET /api/projects/ with the limiter disabled vs enabled, so
+   the difference is the overhead a real request pays.
+
+Usage (from Backend/):
+    python benchmarks/rate_limit_bench.py --repeat 5000 --processes 3
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def percentiles(samples):
+    samples = [s * 1000 for s in samples]
+    return statistics.median(samples), statistics.quantiles(samples, n=100)[98]
+
+
+def hit_samples(uri, strategy_name, repeat, key):
+    from limits import parse, storage, strategies
+
+    import app.services.rate_limit_storage  # noqa: F401  (registers sqlite://)
+
+    limiter = strategies.STRATEGIES[strategy_name](storage.storage_from_string(uri))
+    item = parse("1000000 per minute")
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        limiter.hit(item, key)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _worker(args):
+    uri, strategy_name, repeat = args
+    # Same key in every process: worst case for lock contention
+    return hit_samples(uri, strategy_name, repeat, "bench-shared")
+
+
+def bench_storage(uri, strategy_name, repeat, processes):
+    label = uri.split("://")[0]
+    p50, p99 = percentiles(hit_samples(uri, strategy_name, repeat, f"bench-{os.getpid()}"))
+    print(f"  {label:<7} 1 process    p50={p50:.3f}ms p99={p99:.3f}ms")
+    if processes > 1 and label != "memory":
+        with multiprocessing.get_context("fork").Pool(processes) as pool:
+            results = pool.map(_worker, [(uri, strategy_name, repeat)] * processes)
+        p50, p99 = percentiles([s for r in results for s in r])
+        print(f"  {label:<7} {processes} processes  p50={p50:.3f}ms p99={p99:.3f}ms")
+
+
+def bench_requests(repeat):
+    from app import create_app
+    from app.extensions import db, limiter
+    from app.models import Project
+
+    app = create_app()
+    # The test client acts as the proxy, so CF-Connecting-IP picks the bucket
+    app.config["TRUSTED_PROXY_HOPS"] = 1
+    with app.app_context():
+        db.create_all()
+        if not Project.query.first():
+            db.session.add(Project(slug="bench", title="Bench"))
+            db.session.commit()
+    client = app.test_client()
+
+    def run():
+        samples = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            client.get("/api/projects/", headers={"CF-Connecting-IP": f"10.0.{i % 250}.1"})
+            samples.append(time.perf_counter() - start)
+        return percentiles(samples)
+
+    limiter.enabled = False
+    off = run()
+    limiter.enabled = True
+    on = run()
+    print(f"  limiter off  p50={off[0]:.3f}ms p99={off[1]:.3f}ms")
+    print(f"  limiter on   p50={on[0]:.3f}ms p99={on[1]:.3f}ms  (+{on[0] - off[0]:.3f}ms p50)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5000)
+    parser.add_argument("--processes", type=int, default=3)
+    parser.add_argument("--strategy", default="sliding-window-counter")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="ratelimit-bench-")
+    sqlite_uri = f"sqlite:///{os.path.join(workdir, 'ratelimit.db')}"
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'app.db')}")
+    os.environ.setdefault("LOG_FILE", "")
+    os.environ.setdefault("LOG_ACCESS", "false")
+    os.environ.setdefault("RATELIMIT_STORAGE_URI", sqlite_uri)
+    os.environ.setdefault("RATELIMIT_DEFAULT", "1000000 per hour")
+
+    print(f"storage hit() latency ({args.strategy}, {args.repeat} hits)")
+    bench_storage("memory://", args.strategy, args.repeat, 1)
+    bench_storage(sqlite_uri, args.strategy, args.repeat, args.processes)
+
+    print(f"GET /api/projects/ ({args.repeat} requests, {os.environ['RATELIMIT_STORAGE_URI'].split('://')[0]})")
+    bench_requests(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# benchmarks/run.py
+"""
+Backend load/benchmark suite.
+
+Boots create_app() in-process against SQLite (default) or any DATABASE_URL
+(e.g. the docker-compose MySQL on port 3307), seeds N projects / M comments,
+drives the main endpoints at a configurable concurrency and prints a JSON
+report (p50/p95/p99, RPS, allocations per request) that can be diffed with
+benchmarks/compare.py.
+
+Usage (from Backend/):
+    python benchmarks/run.py --projects 200 --comments 5000 --requests 500 \
+        --concurrency 8 --output bench-before.json
+    python benchmarks/run.py --reset --database-url \
+        "mysql+pymysql://root:pw@127.0.0.1:3307/bench?charset=utf8mb4"
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def start_stub_brevo():
+    """Local stub mail endpoint so the contact outbox never reaches Brevo."""
+    from scripts.stub_brevo import make_handler
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(0.0, 0.0, verbose=False))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_scenarios(slugs):
+    counter = itertools.count()
+    slug_cycle = itertools.cycle(slugs)
+    hot_slug = slugs[0]
+
+    def list_projects(client):
+        return client.get("/api/projects/")
+
+    def search_projects(client):
+        return client.get("/api/projects/", query_string={"q": "dashboard"})
+
+    def project_detail(client):
+        return client.get(f"/api/projects/{next(slug_cycle)}")
+
+    def project_comments(client):
+        return client.get(f"/api/projects/{hot_slug}/comments")
+
+    def post_comment(client):
+        i = next(counter)
+        return client.post(
+            f"/api/projects/{next(slug_cycle)}/comments",
+            json={
+                "name": "Bench User",
+                "email": "bench@example.com",
+                "content": f"Benchmark comment {i} <b>with markup</b>",
+                "captcha_token": f"bench-{i}",
+            },
+        )
+
+    def post_contact(client):
+        i = next(counter)
+        return client.post(
+            "/api/contact",
+            json={
+                "name": "Bench User",
+                "email": "bench@example.com",
+                "message": f"Benchmark contact message {i}",
+                "captcha_token": f"bench-{i}",
+            },
+        )
+
+    return {
+        "projects_list": list_projects,
+        "projects_search": search_projects,
+        "project_detail": project_detail,
+        "project_comments": project_comments,
+        "comment_post": post_comment,
+        "contact_post": post_contact,
+    }
+
+
+def run_latency(app, fn, n_requests, concurrency):
+    local = threading.local()
+
+    def one(_):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        start = time.perf_counter()
+        response = fn(client)
+        elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(n_requests)))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(ms for ms, _ in results)
+    errors = sum(1 for _, status in results if status >= 400)
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "rps": round(n_requests / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+    }
+
+
+def run_allocations(app, fn, n_requests):
+    """Average peak allocation per request, measured single-threaded."""
+    client = app.test_client()
+    fn(client)  # warm-up outside of tracing
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(n_requests):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(client)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_kib_mean": round(statistics.fmean(peaks) / 1024, 2),
+        "alloc_peak_kib_max": round(max(peaks) / 1024, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--database-url", default=None, help="dedicated benchmark DB (default: temp SQLite)"
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="drop all tables in --database-url first"
+    )
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--comments", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--alloc-requests", type=int, default=30)
+    parser.add_argument("--scenarios", default="all", help="comma-separated names")
+    parser.add_argument("--no-cache", action="store_true", help="disable response cache")
+    parser.add_argument("--output", default=None, help="write JSON report here")
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output) if args.output else None
+    tmp = tempfile.mkdtemp(prefix="bench-")
+    stub = start_stub_brevo()
+    os.environ.update(
+        DATABASE_URL=args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        FLASK_DEBUG="0",
+        CAPTCHA_BYPASS="true",
+        RATELIMIT_ENABLED="false",
+        RESPONSE_CACHE_ENABLED="false" if args.no_cache else "true",
+        BREVO_API_URL=f"http://127.0.0.1:{stub.server_port}/v3/smtp/email",
+        BREVO_API_KEY="bench",
+        MAIL_DEFAULT_SENDER="bench@example.com",
+        MAIL_TO="owner@example.com",
+    )
+    # app.log and friends land in the temp dir, not the repo
+    os.chdir(tmp)
+
+    import logging
+
+    from app import create_app
+    from app.extensions import db
+    from benchmarks.data import seed_database
+
+    app = create_app()
+    app.logger.setLevel(logging.WARNING)
+
+    with app.app_context():
+        if args.reset or not args.database_url:
+            db.drop_all()
+        db.create_all()
+        seed_start = time.perf_counter()
+        seed_database(db, args.projects, args.comments)
+        seed_s = time.perf_counter() - seed_start
+        from app.models import Project
+
+        slugs = [row.slug for row in db.session.query(Project.slug).order_by(Project.id)]
+
+    scenarios = build_scenarios(slugs)
+    selected = (
+        list(scenarios)
+        if args.scenarios == "all"
+        else [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    )
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "database": app.config["SQLALCHEMY_DATABASE_URI"].split("://")[0],
+            "projects": args.projects,
+            "comments": args.comments,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "response_cache": not args.no_cache,
+            "seed_seconds": round(seed_s, 2),
+        },
+        "scenarios": {},
+    }
+    for name in selected:
+        fn = scenarios[name]
+        result = run_latency(app, fn, args.requests, args.concurrency)
+        result.update(run_allocations(app, fn, args.alloc_requests))
+        report["scenarios"][name] = result
+        print(f"[bench] {name}: {result['rps']} rps, p95 {result['p95_ms']} ms", file=sys.stderr)
+
+    stub.shutdown()
+    output = json.dumps(report, indent=2)
+    if output_path:
+        with open(output_path, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/sanitizer_bench.py
+"""
+Differential check + microbenchmark of the plain-text sanitizer.
+
+First compares app/utils/text_sanitizer.py against the previous per-field
+bleach code over benchmarks/sanitizer_corpus.py (exits non-zero on any
+difference), then times both on typical comment/contact payloads.
+
+Usage (from Backend/):
+    python benchmarks/sanitizer_bench.py --corpus 5000 --repeat 2000
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import bleach  # noqa: E402
+
+from app.utils.text_sanitizer import clean_text, sanitize_text  # noqa: E402
+from benchmarks.sanitizer_corpus import CASES, generate_corpus  # noqa: E402
+
+_ws_re = re.compile(r"\s+")
+
+
+# --- previous implementations ---
+
+
+def legacy_comment_field(value):
+    # projects.routes.create_project_comment (name / content)
+    return " ".join(bleach.clean(value, tags=[], attributes={}, strip=True).split())
+
+
+def legacy_comment_email(value):
+    return bleach.clean(value, tags=[], attributes={}, strip=True)
+
+
+def legacy_contact_field(value):
+    # contact.routes.sanitize_text
+    cleaned = bleach.clean(text=value, tags=[], attributes={}, protocols=[], strip=True)
+    return _ws_re.sub(" ", cleaned).strip()
+
+
+PAIRS = [
+    ("comment name/content", legacy_comment_field, sanitize_text),
+    ("comment email", legacy_comment_email, clean_text),
+    ("contact name/message", legacy_contact_field, sanitize_text),
+]
+
+
+def check(corpus):
+    failures = 0
+    for label, legacy, current in PAIRS:
+        for value in corpus:
+            expected, got = legacy(value), current(value)
+            if expected != got:
+                failures += 1
+                if failures <= 10:
+                    print(f"MISMATCH [{label}] {value!r}: bleach={expected!r} new={got!r}")
+    return failures
+
+
+def timed(fn, payload, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus)
+    failures = check(corpus)
+    print(f"differential check: {len(corpus)} inputs x {len(PAIRS)} call sites, {failures} mismatches")
+    if failures:
+        sys.exit(1)
+
+    payloads = {
+        "name": "Sivan Pesahov",
+        "comment": " ".join(CASES[2:5]) * 4,
+        "contact message": ("Hi, I saw your portfolio and would love to talk.\n\n" * 10),
+        "with markup": "<b>Hi</b> Tom & Jerry " * 10,
+    }
+    print("median per call (us)")
+    for label, payload in payloads.items():
+        old = timed(legacy_comment_field, payload, args.repeat)
+        new = timed(sanitize_text, payload, args.repeat)
+        print(f"  {label:<16} bleach={old:8.1f}  new={new:8.1f}  ({old / new:.1f}x)")
+
+    # The bleach path on its own: every corpus input that contains markup
+    markup = [value for value in corpus if "<" in value or "&" in value]
+    old = timed(lambda values: [legacy_comment_field(v) for v in values], markup, 5)
+    new = timed(lambda values: [sanitize_text(v) for v in values], markup, 5)
+    print(
+        f"  {'markup corpus':<16} bleach={old / len(markup):8.1f}  "
+        f"new={new / len(markup):8.1f}  ({old / new:.1f}x, {len(markup)} inputs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
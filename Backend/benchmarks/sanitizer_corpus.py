@@ -0,0 +1,57 @@
+# benchmarks/sanitizer_corpus.py
+"""
+Differential corpus for app/utils/text_sanitizer.py: hand-picked edge cases
+plus seeded random strings built from the characters where a fast path could
+diverge from bleach (markup, entities, control characters, exotic whitespace).
+"""
+import random
+
+CASES = [
+    "",
+    " ",
+    "Awesome work!",
+    "  Really   clean UI,\thow did you\nhandle caching?  ",
+    "עבודה מעולה, אהבתי את העיצוב",
+    "emoji 🚀 and CJK 漢字",
+    "<b>bold</b> text",
+    "<script>alert(1)</script>hello",
+    "<img src=x onerror=alert(1)>",
+    "<a href='javascript:alert(1)'>click</a>",
+    "<!-- comment -->after",
+    "<![CDATA[x]]>y",
+    "<<b>>nested<</b>>",
+    "1 < 2 and 3 > 2",
+    "a > b > c",
+    "Tom & Jerry",
+    "&amp; &lt; &gt; &quot; &#39; &#x27; &copy; &nbsp;",
+    "&copy &amp &unknown; &#; &#xZZ;",
+    "AT&T <br> R&D",
+    "x\x00y",
+    "bell\x07 backspace\x08 vt\x0b ff\x0c so\x0e us\x1f",
+    "file\x1cgroup\x1drecord\x1eunit\x1f",
+    "del\x7f c1\x80\x85\x9f",
+    "crlf\r\nand cr\rand lf\n",
+    "\r\n\r\n",
+    "nbsp\xa0thin line para zwsp​bom﻿",
+    "noncharacters ￾ ￿ \U0010ffff",
+    "quotes \" and ' and `",
+    "user+tag@example.com",
+    "<user@example.com>",
+    "a\x00<b>\x01</b>&amp;\r\n",
+]
+
+ALPHABET = (
+    list("abcXYZ019 .,!?-_'\"/=")
+    + list("אבגשלום🚀漢")
+    + ["<", ">", "&", ";", "#", "\t", "\n", "\r", "\r\n", "\x00", "\x01", "\x0b", "\x0c", "\x1c", "\x1f", "\x7f", "\x85", "\xa0", " ", "​"]
+    + ["<b>", "</b>", "<p class='x'>", "<br/>", "<!--", "-->", "&amp;", "&lt;", "&#60;", "&copy", "&nbsp;"]
+)
+
+
+def generate_corpus(n: int = 5000, seed: int = 1, max_tokens: int = 40):
+    """`CASES` followed by `n` random strings (deterministic for a seed)."""
+    rng = random.Random(seed)
+    corpus = list(CASES)
+    for _ in range(n):
+        corpus.append("".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_tokens))))
+    return corpus
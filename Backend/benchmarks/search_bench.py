@@ -0,0 +1,151 @@
+# benchmarks/search_bench.py
+"""
+Compare project search latency: LIKE '%q%' scan vs. the in-process index.
+
+Before timing, checks recall (exits non-zero on a miss): RECALL_CASES must
+match through stemming, and every project LIKE finds for QUERIES must also
+be found by the index.
+
+Usage (from Backend/):
+    python benchmarks/search_bench.py --projects 10000 --repeat 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+WORDS = (
+    "react flask python queue cache redis mysql dashboard realtime crypto "
+    "task kanban analytics landing seo nextjs typescript express mongodb "
+    "career tracking insights streaming prices history responsive mobile "
+    "פרויקט ניהול משימות אתר אישי"
+).split()
+
+QUERIES = ["react", "dashboard cache", "anal", "typescript express", "משימות", "zzz"]
+
+# (document title, query): singular/plural and inflections must meet on one term
+RECALL_CASES = [
+    ("Image services", "service"),
+    ("Image services", "image service"),
+    ("Image service", "services"),
+    ("Caching layer", "cache"),
+    ("Cached prices", "caching price"),
+    ("Boxes and crates", "box crate"),
+    ("Success stories", "story"),
+    ("Created dashboards", "create dashboard"),
+    ("Realtime streaming", "streams"),
+    ("Analytics", "analytic"),
+    ("ניהול משימות", "משימות"),
+]
+
+
+def random_text(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def check_recall():
+    from app.services.search import InvertedIndex
+
+    failures = 0
+    for title, query in RECALL_CASES:
+        index = InvertedIndex()
+        index.upsert(1, "x", {"title": title})
+        if not index.search(query):
+            failures += 1
+            print(f"MISS: {query!r} does not find {title!r}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "search_bench.db")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{db_path}"
+
+    from sqlalchemy import or_, func
+    from app import create_app
+    from app.extensions import db, project_search
+    from app.models import Project
+
+    app = create_app()
+    rng = random.Random(42)
+
+    with app.app_context():
+        db.create_all()
+        if not Project.query.first():
+            db.session.bulk_insert_mappings(
+                Project,
+                [
+                    {
+                        "slug": f"bench-{i}",
+                        "title": random_text(rng, 3).title(),
+                        "short_description": random_text(rng, 10),
+                        "description_md": random_text(rng, 120),
+                    }
+                    for i in range(args.projects)
+                ],
+            )
+            db.session.commit()
+
+        start = time.perf_counter()
+        project_search.refresh(db, version=0, force=True)
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"index build: {build_ms:.1f} ms for {len(project_search.index)} projects")
+
+        def like(q):
+            ql = q.lower()
+            return (
+                Project.query.filter(
+                    or_(
+                        func.lower(Project.title).like(f"%{ql}%"),
+                        func.lower(Project.short_description).like(f"%{ql}%"),
+                        func.lower(Project.description_md).like(f"%{ql}%"),
+                    )
+                )
+                .with_entities(Project.id)
+                .all()
+            )
+
+        def indexed(q):
+            return project_search.search_ids(db, q, version=0)
+
+        failures = check_recall()
+        for q in QUERIES:
+            missing = {row.id for row in like(q)} - set(indexed(q))
+            if missing:
+                failures += 1
+                print(f"MISS: index lacks {len(missing)} LIKE hits for {q!r}")
+        print(f"recall check: {len(RECALL_CASES)} cases + {len(QUERIES)} LIKE queries, {failures} misses")
+        if failures:
+            sys.exit(1)
+
+        print(f"{'query':<22}{'LIKE p50/max ms':>20}{'index p50/max ms':>20}")
+        for q in QUERIES:
+            like_p50, like_max = timed(lambda: like(q), args.repeat)
+            idx_p50, idx_max = timed(lambda: indexed(q), args.repeat)
+            print(
+                f"{q:<22}{like_p50:>12.2f} / {like_max:<7.2f}"
+                f"{idx_p50:>12.2f} / {idx_max:<7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
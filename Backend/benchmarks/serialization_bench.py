@@ -0,0 +1,102 @@
+# benchmarks/serialization_bench.py
+"""
+Microbenchmark of the /api/projects/ serialization path, without the DB.
+
+Compares the previous path (fresh ProjectListSchema per request, json.loads
+of images_json per row, stdlib JSON) with the current one (compiled list
+dumper, cached image decoding, orjson when installed), and checks that
+both produce the same JSON document.
+
+Usage (from Backend/):
+    python benchmarks/serialization_bench.py --projects 200 --repeat 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def timed(fn, repeat):
+    fn()  # warm-up (fills the image decode cache like a running worker)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), statistics.quantiles(samples, n=100)[94]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("LOG_FILE", "")
+    from marshmallow import fields
+
+    from app import create_app
+    from app.models import Project, ProjectImage
+    from app.models.models import image_urls_from_json
+    from app.projects.schemas import ProjectListSchema, dump_project_list
+    from app.utils.json_provider import orjson
+    from benchmarks.data import generate_projects
+
+    app = create_app()
+    projects = [
+        Project(
+            id=i + 1,
+            gallery=[
+                ProjectImage(position=position, url=url)
+                for position, url in enumerate(image_urls_from_json(row["images_json"]) or [])
+            ],
+            **row,
+        )
+        for i, row in enumerate(generate_projects(args.projects))
+    ]
+
+    class LegacyListSchema(ProjectListSchema):
+        images = fields.Method("get_images")
+
+        def get_images(self, obj):
+            try:
+                return json.loads(obj.images_json) if obj.images_json else []
+            except Exception:
+                return []
+
+    def legacy():
+        data = LegacyListSchema(many=True).dump(projects)
+        return json.dumps({"data": data, "error": None}, sort_keys=True).encode("utf-8")
+
+    def marshmallow_cached():
+        data = ProjectListSchema(many=True).dump(projects)
+        return json.dumps({"data": data, "error": None}, sort_keys=True).encode("utf-8")
+
+    with app.app_context():
+        from app.utils.responses import json_body
+
+        def current():
+            return json_body(data=dump_project_list(projects))
+
+        assert json.loads(legacy()) == json.loads(current()), "serializers disagree"
+
+        print(f"{args.projects} projects, encoder: {'orjson' if orjson else 'stdlib'}")
+        print(f"{'path':<34}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, fn in (
+            ("marshmallow + json.loads + json", legacy),
+            ("marshmallow + cached images", marshmallow_cached),
+            ("compiled dumper + fast encoder", current),
+        ):
+            p50, p95 = timed(fn, args.repeat)
+            print(f"{name:<34}{p50:>10.3f}{p95:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# benchmarks/slow_provider_load.py
+"""
+Concurrent request capacity while the captcha provider is slow.
+
+Boots gunicorn with the chosen worker class against SQLite, points captcha
+verification at the local stub (scripts/stub_brevo.py) with an artificial
+delay, then fires concurrent comment POSTs and project GETs.
+
+Usage (from Backend/):
+    python benchmarks/slow_provider_load.py --worker-class sync
+    python benchmarks/slow_provider_load.py --worker-class gthread --threads 8
+    python benchmarks/slow_provider_load.py --worker-class gevent
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def wait_for(url, timeout=20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def request(method, url, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(
+        url, data=data, method=method, headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--worker-class", default="sync")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--provider-delay", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=30)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stub-port", type=int, default=8766)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'load.db')}",
+        FLASK_DEBUG="0",
+        CAPTCHA_BYPASS="false",
+        CAPTCHA_PROVIDER="turnstile",
+        TURNSTILE_SECRET="stub",
+        TURNSTILE_VERIFY_URL=f"http://127.0.0.1:{args.stub_port}/siteverify",
+        RATELIMIT_ENABLED="false",
+        RESPONSE_CACHE_ENABLED="false",
+        PORT=str(args.port),
+        GUNICORN_WORKER_CLASS=args.worker_class,
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+    )
+
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from app import create_app; from app.extensions import db; "
+            "from app.models import Project; app = create_app()\n"
+            "with app.app_context():\n"
+            "    db.create_all(); db.session.add(Project(slug='demo', title='Demo')); "
+            "db.session.commit()",
+        ],
+        cwd=tmp,
+        env=dict(env, PYTHONPATH=BACKEND_DIR),
+        check=True,
+        capture_output=True,
+    )
+
+    stub = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(BACKEND_DIR, "scripts", "stub_brevo.py"),
+            "--port",
+            str(args.stub_port),
+            "--delay",
+            str(args.provider_delay),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            os.path.join(BACKEND_DIR, "gunicorn.conf.py"),
+            "--chdir",
+            BACKEND_DIR,
+            "app:create_app()",
+        ],
+        cwd=tmp,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_for(f"{base}/health")
+
+        def post(i):
+            return request(
+                "POST",
+                f"{base}/api/projects/demo/comments",
+                {
+                    "name": "Load",
+                    "email": "load@example.com",
+                    "content": f"comment {i}",
+                    "captcha_token": f"token-{i}",
+                },
+            )
+
+        def get(_):
+            return request("GET", f"{base}/api/projects/demo")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency * 2) as pool:
+            posts = [pool.submit(post, i) for i in range(args.concurrency)]
+            gets = [pool.submit(get, i) for i in range(args.concurrency)]
+            post_results = [f.result() for f in posts]
+            get_results = [f.result() for f in gets]
+        wall = time.perf_counter() - start
+
+        def summary(results):
+            latencies = sorted(ms for _, ms in results)
+            return {
+                "ok": sum(1 for status, _ in results if status < 400),
+                "p50_ms": round(latencies[len(latencies) // 2], 1),
+                "max_ms": round(latencies[-1], 1),
+            }
+
+        print(
+            json.dumps(
+                {
+                    "worker_class": args.worker_class,
+                    "workers": args.workers,
+                    "threads": args.threads,
+                    "provider_delay_s": args.provider_delay,
+                    "concurrency": args.concurrency,
+                    "wall_s": round(wall, 2),
+                    "comment_post": summary(post_results),
+                    "project_get": summary(get_results),
+                },
+                indent=2,
+            )
+        )
+    finally:
+        server.terminate()
+        stub.terminate()
+        server.wait()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
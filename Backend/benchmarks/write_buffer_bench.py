@@ -0,0 +1,127 @@
+# benchmarks/write_buffer_bench.py
+"""
+Burst-load benchmark for the comment insert path (services/write_buffer.py).
+
+N threads each insert M comments through `write_buffer.save()` (the call the
+POST route makes), once per mode:
+- off:      add + commit per row (the previous code path)
+- flush:    group commit, request waits for its batch to commit
+- enqueue:  group commit, request returns once the row is queued
+
+Reports throughput, per-save latency (p50/p99) and rows per batch. Uses a
+file-backed SQLite DB by default so every commit pays a real fsync; point
+DATABASE_URL at MySQL for production-like numbers.
+
+Usage (from Backend/):
+    python benchmarks/write_buffer_bench.py --threads 16 --per-thread 100
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def run(app, write_buffer, project_id, threads, per_thread):
+    from app.models import Comment
+
+    latencies = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(threads)
+
+    def worker(n):
+        local = []
+        with app.app_context():
+            start_gate.wait()
+            for i in range(per_thread):
+                comment = Comment(
+                    project_id=project_id,
+                    name=f"bench {n}",
+                    email="bench@example.com",
+                    content=f"burst comment {n}-{i}",
+                )
+                start = time.perf_counter()
+                write_buffer.save(comment)
+                local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    # Enqueue mode returns early; count the time until the rows are in the DB
+    write_buffer.close(timeout=60)
+    elapsed = time.perf_counter() - started
+    return elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--per-thread", type=int, default=100)
+    parser.add_argument("--max-delay-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=100)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="write-buffer-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'app.db')}")
+    os.environ.setdefault("LOG_FILE", "")
+    os.environ.setdefault("LOG_ACCESS", "false")
+    os.environ["METRICS_ENABLED"] = "false"
+    os.environ["FLASK_DEBUG"] = "0"
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import Comment, Project
+    from app.services.write_buffer import write_buffer
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        project = Project(slug="bench", title="Bench")
+        db.session.add(project)
+        db.session.commit()
+        project_id = project.id
+        url = db.engine.url.render_as_string(hide_password=True)
+
+    total = args.threads * args.per_thread
+    print(f"{args.threads} threads x {args.per_thread} inserts ({total} rows), {url}")
+    baseline = None
+    for mode in ("off", "flush", "enqueue"):
+        write_buffer.enabled = mode != "off"
+        write_buffer.durability = "flush" if mode == "off" else mode
+        write_buffer.max_delay = args.max_delay_ms / 1000.0
+        write_buffer.max_batch = args.max_batch
+        write_buffer._stats.update(rows=0, batches=0, failed_rows=0, rejected=0)
+
+        elapsed, latencies = run(app, write_buffer, project_id, args.threads, args.per_thread)
+        stats = write_buffer._stats
+        rate = total / elapsed
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        batches = f"{stats['rows'] / stats['batches']:.1f} rows/batch" if stats["batches"] else "1 row/commit"
+        speedup = f"  ({rate / baseline:.1f}x)" if baseline else ""
+        print(
+            f"  {mode:<8} {rate:8.0f} rows/s  save p50={p50:.2f}ms p99={p99:.2f}ms  "
+            f"{batches}, {stats['failed_rows']} failed, {stats['rejected']} rejected{speedup}"
+        )
+        baseline = baseline or rate
+
+    with app.app_context():
+        stored = db.session.query(Comment).count()
+    print(f"rows stored: {stored} (expected {total * 3})")
+    if stored != total * 3:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,5 +26,6 @@ echo "📦 Running Alembic migrations..."
 alembic upgrade head
 
 echo "🚀 Starting Gunicorn..."
-PORT=${PORT:-8000}
-echo "🌐 Binding Gunicorn on port ${PORT}" && exec gunicorn --workers 3 --bind 0.0.0.0:${PORT} --timeout 60 'app:create_app()'
\ No newline at end of file
+export PORT=${PORT:-8000}
+# Worker class / count / threads come from GUNICORN_* env vars, see gunicorn.conf.py
+echo "🌐 Binding Gunicorn on port ${PORT} (worker class: ${GUNICORN_WORKER_CLASS:-sync})" && exec gunicorn -c gunicorn.conf.py 'app:create_app()'
\ No newline at end of file
@@ -0,0 +1,53 @@
+# gunicorn.conf.py
+# Serving mode is selected through env vars (used by entrypoint.sh):
+#
+#   GUNICORN_WORKER_CLASS=sync     one request per worker (original behavior)
+#   GUNICORN_WORKER_CLASS=gthread  GUNICORN_THREADS requests per worker
+#   GUNICORN_WORKER_CLASS=gevent   cooperative I/O: outbound HTTP (requests) and
+#                                  the pure-Python PyMySQL driver stop blocking
+#                                  the worker while captcha/Brevo/MySQL are slow
+#                                  (requirements-async.txt, installed in the image)
+#
+# To host the app on an ASGI server instead (a thread-pool shim), see asgi.py.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("GUNICORN_WORKERS", "3"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+# Concurrent greenlets per worker when worker_class=gevent
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "200"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+
+# /metrics merges per-worker snapshot files (see app/services/metrics.py);
+# drop a worker's file as soon as it exits so its gauges don't linger.
+def _metrics_dir():
+    import tempfile
+
+    return os.getenv("METRICS_DIR") or os.path.join(tempfile.gettempdir(), "personal-site-metrics")
+
+
+def on_starting(server):
+    directory = _metrics_dir()
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.startswith("worker-"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+
+def post_worker_init(worker):
+    # Drain the email outbox from boot, not only after the next contact POST
+    from app.services.outbox import outbox_worker
+
+    outbox_worker.start()
+
+
+def child_exit(server, worker):
+    try:
+        os.remove(os.path.join(_metrics_dir(), f"worker-{worker.pid}.json"))
+    except OSError:
+        pass
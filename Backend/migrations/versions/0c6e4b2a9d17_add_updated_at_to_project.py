@@ -0,0 +1,42 @@
+"""add project.updated_at (Last-Modified of project responses)
+
+Revision ID: 0c6e4b2a9d17
+Revises: f3a8c1d9e604
+Create Date: 2026-10-19 00:21:03.118460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c6e4b2a9d17'
+down_revision: Union[str, Sequence[str], None] = 'f3a8c1d9e604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable and without a server default: SQLite cannot ADD COLUMN with
+    # now() as default; the model fills it on insert and update
+    op.add_column('project', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Existing rows: the newest known change, else the migration time
+    project = sa.table(
+        'project',
+        sa.column('updated_at', sa.DateTime),
+        sa.column('last_comment_at', sa.DateTime),
+    )
+    op.get_bind().execute(
+        sa.update(project).values(
+            updated_at=sa.func.coalesce(project.c.last_comment_at, sa.func.now())
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('project', 'updated_at')
@@ -0,0 +1,39 @@
+"""add FULLTEXT search index to project
+
+Revision ID: 3f9c2a7d41b8
+Revises: 6dafdb7ec787
+Create Date: 2026-10-18 20:05:12.104233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b8'
+down_revision: Union[str, Sequence[str], None] = '6dafdb7ec787'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FULLTEXT is MySQL-only; other dialects use the in-process search index
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.create_index(
+        'ft_project_search',
+        'project',
+        ['title', 'short_description', 'description_md'],
+        unique=False,
+        mysql_prefix='FULLTEXT',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.drop_index('ft_project_search', table_name='project')
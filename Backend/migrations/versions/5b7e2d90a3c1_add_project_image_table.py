@@ -0,0 +1,59 @@
+"""add project_image table backfilled from project.images_json
+
+Revision ID: 5b7e2d90a3c1
+Revises: c27d9b6e8f14
+Create Date: 2026-10-18 21:32:10.418207
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2d90a3c1'
+down_revision: Union[str, Sequence[str], None] = 'c27d9b6e8f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    project_image = op.create_table(
+        'project_image',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=1024), nullable=False),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('variants', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'position', name='uq_project_image_position'),
+    )
+
+    # Backfill: one row per URL in images_json. Rows whose images_json is not
+    # a plain list of strings get no images and keep being served from the text.
+    project = sa.table('project', sa.column('id', sa.Integer), sa.column('images_json', sa.Text))
+    rows = []
+    for project_id, images_json in op.get_bind().execute(sa.select(project.c.id, project.c.images_json)):
+        try:
+            images = json.loads(images_json) if images_json else []
+        except ValueError:
+            continue
+        if not isinstance(images, list) or not all(isinstance(i, str) for i in images):
+            continue
+        rows.extend(
+            {'project_id': project_id, 'position': position, 'url': url}
+            for position, url in enumerate(images)
+        )
+    if rows:
+        op.bulk_insert(project_image, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_image')
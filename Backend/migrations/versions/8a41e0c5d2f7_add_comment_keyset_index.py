@@ -0,0 +1,28 @@
+"""add (project_id, created_at, id) index to comment
+
+Revision ID: 8a41e0c5d2f7
+Revises: 3f9c2a7d41b8
+Create Date: 2026-10-18 20:21:40.518027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a41e0c5d2f7'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d41b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_comment_project_created_id', 'comment', ['project_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comment_project_created_id', table_name='comment')
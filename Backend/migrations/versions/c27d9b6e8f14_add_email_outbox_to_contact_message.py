@@ -0,0 +1,40 @@
+"""add email outbox columns to contact_message
+
+Revision ID: c27d9b6e8f14
+Revises: 8a41e0c5d2f7
+Create Date: 2026-10-18 20:48:03.771650
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27d9b6e8f14'
+down_revision: Union[str, Sequence[str], None] = '8a41e0c5d2f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows were sent synchronously before the outbox existed
+    op.add_column('contact_message', sa.Column('delivery_status', sa.String(length=16), server_default='sent', nullable=False))
+    op.alter_column('contact_message', 'delivery_status', server_default='pending', existing_type=sa.String(length=16), existing_nullable=False)
+    op.add_column('contact_message', sa.Column('delivery_attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('contact_message', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    op.add_column('contact_message', sa.Column('last_error', sa.String(length=500), nullable=True))
+    op.add_column('contact_message', sa.Column('sent_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_contact_message_outbox', 'contact_message', ['delivery_status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contact_message_outbox', table_name='contact_message')
+    op.drop_column('contact_message', 'sent_at')
+    op.drop_column('contact_message', 'last_error')
+    op.drop_column('contact_message', 'next_attempt_at')
+    op.drop_column('contact_message', 'delivery_attempts')
+    op.drop_column('contact_message', 'delivery_status')
@@ -0,0 +1,60 @@
+"""add comment_count / last_comment_at to project, backfilled from comment
+
+Revision ID: d19a6f3c7b52
+Revises: 5b7e2d90a3c1
+Create Date: 2026-10-18 23:05:47.912364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd19a6f3c7b52'
+down_revision: Union[str, Sequence[str], None] = '5b7e2d90a3c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('project', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('project', sa.Column('last_comment_at', sa.DateTime(), nullable=True))
+
+    # Backfill with one correlated UPDATE (scripts/backfill_comment_stats.py
+    # does the same for a running database)
+    project = sa.table(
+        'project',
+        sa.column('id', sa.Integer),
+        sa.column('comment_count', sa.Integer),
+        sa.column('last_comment_at', sa.DateTime),
+    )
+    comment = sa.table(
+        'comment',
+        sa.column('id', sa.Integer),
+        sa.column('project_id', sa.Integer),
+        sa.column('created_at', sa.DateTime),
+    )
+    op.get_bind().execute(
+        sa.update(project).values(
+            comment_count=sa.select(sa.func.count(comment.c.id))
+            .where(comment.c.project_id == project.c.id)
+            .scalar_subquery(),
+            last_comment_at=sa.select(sa.func.max(comment.c.created_at))
+            .where(comment.c.project_id == project.c.id)
+            .scalar_subquery(),
+        )
+    )
+
+    op.create_index('ix_project_comment_count_id', 'project', ['comment_count', 'id'], unique=False)
+    op.create_index('ix_project_last_comment_at_id', 'project', ['last_comment_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_last_comment_at_id', table_name='project')
+    op.drop_index('ix_project_comment_count_id', table_name='project')
+    op.drop_column('project', 'last_comment_at')
+    op.drop_column('project', 'comment_count')
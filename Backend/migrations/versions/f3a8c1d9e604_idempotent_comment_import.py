@@ -0,0 +1,42 @@
+"""add comment.import_key and the import_checkpoint table
+
+Revision ID: f3a8c1d9e604
+Revises: d19a6f3c7b52
+Create Date: 2026-10-18 23:48:20.531907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c1d9e604'
+down_revision: Union[str, Sequence[str], None] = 'd19a6f3c7b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('comment', sa.Column('import_key', sa.String(length=32), nullable=True))
+    op.create_index('ix_comment_import_key', 'comment', ['import_key'], unique=True)
+
+    op.create_table(
+        'import_checkpoint',
+        sa.Column('input_key', sa.String(length=32), nullable=False),
+        sa.Column('path', sa.String(length=1024), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('mtime_ns', sa.BigInteger(), nullable=False),
+        sa.Column('committed', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('input_key'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_checkpoint')
+    op.drop_index('ix_comment_import_key', table_name='comment')
+    op.drop_column('comment', 'import_key')
@@ -0,0 +1,75 @@
+# scripts/backfill_comment_stats.py
+"""
+Recompute project.comment_count / last_comment_at from the comment table.
+
+The migration backfills them once and the comment write paths keep them up
+to date; run this after editing comments by hand (raw SQL skips the hooks)
+or to check for drift.
+
+Run:  python scripts/backfill_comment_stats.py [--batch-size 500] [--dry-run]
+"""
+import argparse
+
+from dotenv import load_dotenv
+
+# Load .env from project root when running: `python scripts/backfill_comment_stats.py`
+load_dotenv(dotenv_path=".env")
+
+from sqlalchemy import func, select
+
+from app import create_app
+from app.extensions import db, response_cache
+from app.models.models import Comment, Project, refresh_comment_stats
+
+
+def drifted_ids(project_ids):
+    """Projects whose stored stats differ from a recount."""
+    counts = (
+        select(
+            Comment.project_id,
+            func.count(Comment.id).label("n"),
+            func.max(Comment.created_at).label("last"),
+        )
+        .where(Comment.project_id.in_(project_ids))
+        .group_by(Comment.project_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(Project.id, Project.comment_count, Project.last_comment_at, counts.c.n, counts.c.last)
+        .outerjoin(counts, counts.c.project_id == Project.id)
+        .where(Project.id.in_(project_ids))
+    ).all()
+    return [
+        project_id
+        for project_id, stored_count, stored_last, count, last in rows
+        if stored_count != (count or 0) or stored_last != last
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="only report drift")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        ids = db.session.scalars(select(Project.id).order_by(Project.id)).all()
+        fixed = 0
+        # One short transaction per batch, so comment writes aren't blocked for long
+        for start in range(0, len(ids), args.batch_size):
+            batch = drifted_ids(ids[start : start + args.batch_size])
+            fixed += len(batch)
+            if batch and not args.dry_run:
+                refresh_comment_stats(db.session, batch)
+            db.session.commit()
+
+        if fixed and not args.dry_run:
+            response_cache.bump_version(projects=False)
+
+    verb = "would fix" if args.dry_run else "fixed"
+    print(f"Comment stats: {len(ids)} projects checked, {verb} {fixed}.")
+
+
+if __name__ == "__main__":
+    main()
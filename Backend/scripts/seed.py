@@ -6,27 +6,14 @@ import json
 load_dotenv(dotenv_path=".env")
 
 from app import create_app
-from app.extensions import db
+from app.extensions import db, response_cache
 from app.models.models import Project, Comment
+from app.services.bulk_import import upsert_projects
 
-app = create_app()
 
-
-def upsert_project(**kwargs):
-    slug = kwargs["slug"]
-    p = Project.query.filter_by(slug=slug).first()
-    if p:
-        for k, v in kwargs.items():
-            setattr(p, k, v)
-        return p
-    p = Project(**kwargs)
-    db.session.add(p)
-    return p
-
-
-with app.app_context():
-    # --- Projects ---
-    p1 = upsert_project(
+# --- Projects ---
+PROJECTS = [
+    dict(
         slug="crypto-streamer",
         title="Crypto Streamer",
         short_description="Realtime crypto dashboard with queues & caching",
@@ -45,9 +32,8 @@ with app.app_context():
                 "https://res.cloudinary.com/dipx5fuza/image/upload/v1760530334/Screenshot_2025-08-29_at_16.58.48_afpgkt.png",
             ]
         ),
-    )
-
-    p2 = upsert_project(
+    ),
+    dict(
         slug="taskify",
         title="Taskify",
         short_description="Task management with Kanban & analytics",
@@ -69,9 +55,8 @@ with app.app_context():
                 "https://res.cloudinary.com/dipx5fuza/image/upload/v1760530334/Screenshot_2025-09-01_at_13.35.58_lk0for.png",
             ]
         ),
-    )
-
-    p3 = upsert_project(
+    ),
+    dict(
         slug="relyon-landing",
         title="Relyon Landing",
         short_description="Product landing page with clean UX & SEO",
@@ -90,9 +75,8 @@ with app.app_context():
                 "https://res.cloudinary.com/dipx5fuza/image/upload/v1760530933/Screenshot_2025-10-15_at_15.22.05_uzgds1.png",
             ]
         ),
-    )
-
-    p4 = upsert_project(
+    ),
+    dict(
         slug="job-flow",
         title="Job Flow",
         short_description="AI-powered job tracking app for smarter career management",
@@ -111,20 +95,35 @@ with app.app_context():
                 "https://res.cloudinary.com/dipx5fuza/image/upload/v1761481848/Screenshot_2025-10-26_at_14.30.42_ffraku.png"
             ]
         ),
-    )
+    ),
+]
 
-    db.session.commit()
 
-    # --- Comments (approved demo) ---
-    if not Comment.query.filter_by(project_id=p1.id).first():
-        db.session.add(
-            Comment(
-                project_id=p1.id,
-                name="Sivan",
-                email="sivan@example.com",
-                content="Awesome work!",
-            )
-        )
+def main():
+    app = create_app()
+    with app.app_context():
+        # One INSERT ... ON DUPLICATE KEY UPDATE / ON CONFLICT for the catalog
+        upsert_projects(PROJECTS)
         db.session.commit()
 
+        # --- Comments (approved demo) ---
+        p1 = Project.query.filter_by(slug=PROJECTS[0]["slug"]).one()
+        if not Comment.query.filter_by(project_id=p1.id).first():
+            db.session.add(
+                Comment(
+                    project_id=p1.id,
+                    name="Sivan",
+                    email="sivan@example.com",
+                    content="Awesome work!",
+                )
+            )
+            db.session.commit()
+
+        # Invalidate cached project responses in every worker sharing the cache backend
+        response_cache.bump_version()
+
     print("Seed done: upserted projects and an approved comment.")
+
+
+if __name__ == "__main__":
+    main()
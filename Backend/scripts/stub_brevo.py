@@ -0,0 +1,75 @@
+# scripts/stub_brevo.py
+"""
+Local stand-in for the Brevo transactional email API (and a captcha
+siteverify endpoint that accepts every token), for offline testing.
+
+Run:  python scripts/stub_brevo.py --port 8025 [--fail-rate 0.3] [--delay 0.5]
+Then: BREVO_API_URL=http://127.0.0.1:8025/v3/smtp/email BREVO_API_KEY=stub
+      TURNSTILE_VERIFY_URL=http://127.0.0.1:8025/siteverify TURNSTILE_SECRET=stub
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(fail_rate: float, delay: float, verbose: bool = True):
+    class StubBrevoHandler(BaseHTTPRequestHandler):
+        sent = []
+
+        def _reply(self, status: int, body: dict):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length)
+            if delay:
+                time.sleep(delay)
+            if self.path.endswith("/siteverify"):
+                if random.random() < fail_rate:
+                    return self._reply(503, {"success": False})
+                return self._reply(200, {"success": True})
+            payload = json.loads(body or b"{}")
+            if not self.headers.get("api-key"):
+                return self._reply(401, {"code": "unauthorized", "message": "Key not found"})
+            if random.random() < fail_rate:
+                return self._reply(503, {"code": "unavailable", "message": "stub failure"})
+            self.sent.append(payload)
+            if verbose:
+                print(f"[stub-brevo] #{len(self.sent)} {payload.get('subject')}")
+            return self._reply(201, {"messageId": f"<{uuid.uuid4()}@stub.brevo>"})
+
+        def do_GET(self):
+            # Inspect what was "delivered"
+            return self._reply(200, {"sent": self.sent})
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubBrevoHandler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port), make_handler(args.fail_rate, args.delay)
+    )
+    print(f"Stub Brevo listening on http://{args.host}:{args.port}/v3/smtp/email")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
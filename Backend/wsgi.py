@@ -8,4 +8,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 app = create_app()
 
 if __name__ == "__main__":
+    from app.services.outbox import outbox_worker
+
+    outbox_worker.start()
     app.run(host="127.0.0.1", port=5000)